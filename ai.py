@@ -2,25 +2,241 @@
 Модуль искусственного интеллекта для игры в шашки
 """
 
+import hashlib
+import json
+import os
 import random
+import struct
 import time
+import zlib
 from copy import deepcopy
 
+from transposition import EXACT, LOWER, UPPER, TranspositionTable
+
+# Файл с настроенными весами оценочной функции (создается модулем tuner.py)
+WEIGHTS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'weights.json')
+
+# Веса признаков оценочной функции по умолчанию
+DEFAULT_WEIGHTS = {
+    'piece': 10,      # Каждая шашка (включая дамки)
+    'king': 35,       # Дополнительная ценность дамки (15 + 20 бонус)
+    'advance': 1,     # Продвижение простой шашки к полю превращения
+    'center': 0.5,    # Близость к центру доски
+    'capture': 5      # Каждый доступный ход со взятием
+}
+
+FEATURES = tuple(DEFAULT_WEIGHTS)
+
+# Файл с сохраненным состоянием ИИ (таблица транспозиций, история ходов, кеш оценок)
+STATE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ai_state.bin')
+
+# Версия формата файла состояния
+STATE_VERSION = 2
+_STATE_MAGIC = b'SASK'
+_STATE_HEADER = struct.Struct('<4sH20s20sI')  # Метка, версия, отпечаток правил, отпечаток весов, длина
+_TT_RECORD = struct.Struct('<QBBdH')          # Ключ, глубина, тип оценки, оценка, ход
+_HISTORY_RECORD = struct.Struct('<HI')        # Ход, счетчик
+_EVAL_RECORD = struct.Struct('<Qd')           # Ключ, оценка
+_NO_MOVE = 0xFFFF
+
+# Максимальный размер кеша оценок; при переполнении кеш очищается
+EVAL_CACHE_SIZE = 500000
+
+# Бюджет решателя df-pn на один уровень сложности (количество раскрытых позиций)
+SOLVER_NODES_PER_LEVEL = 5000
+
+# Добавка к ключу позиции в таблице транспозиций для ИИ, играющего черными
+_BLACK_AI_KEY = 0x9E3779B97F4A7C15
+
+_loaded_weights = None
+
+
+class SearchAborted(Exception):
+    """Поиск прерван: исчерпан бюджет позиций или времени (см. AI.search)"""
+
+
+def load_weights(path=WEIGHTS_FILE):
+    """
+    Загрузка весов оценочной функции из файла
+    
+    Отсутствующие в файле признаки получают значения по умолчанию.
+    Если файла нет, возвращаются веса по умолчанию.
+    
+    Args:
+        path: Путь к JSON-файлу с весами
+        
+    Returns:
+        dict: Веса признаков
+    """
+    weights = dict(DEFAULT_WEIGHTS)
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        weights.update({name: float(data[name]) for name in FEATURES if name in data})
+    return weights
+
+
+def save_weights(weights, path=WEIGHTS_FILE):
+    """Сохранение весов оценочной функции в JSON-файл"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({name: weights[name] for name in FEATURES}, f, indent=4)
+
+
+def get_weights():
+    """Веса оценочной функции, загружаемые один раз при первом обращении"""
+    global _loaded_weights
+    if _loaded_weights is None:
+        _loaded_weights = load_weights()
+    return _loaded_weights
+
+
+def rules_fingerprint():
+    """
+    Отпечаток правил игры: SHA-1 исходного кода board.py
+    
+    Сохраненное состояние ИИ становится недействительным при любом изменении правил.
+    """
+    import board
+    with open(board.__file__, 'rb') as f:
+        return hashlib.sha1(f.read()).digest()
+
+
+def weights_fingerprint(weights):
+    """Отпечаток весов оценочной функции (от них зависят сохраненные оценки)"""
+    data = json.dumps([float(weights[name]) for name in FEATURES])
+    return hashlib.sha1(data.encode('utf-8')).digest()
+
+
+def extract_features(board):
+    """
+    Вычисление признаков позиции для оценочной функции
+    
+    Все признаки считаются с точки зрения белых: вклад белых
+    шашек положительный, черных - отрицательный.
+    
+    Args:
+        board: Текущее состояние доски
+        
+    Returns:
+        list: Значения признаков в порядке FEATURES
+    """
+    kings = 0
+    advance = 0
+    center = 0
+    
+    for row in range(8):
+        for col in range(8):
+            piece = board.get_piece(row, col)
+            if piece == board.EMPTY:
+                continue
+            
+            # Дамки
+            if piece == board.WHITE_KING:
+                kings += 1
+            elif piece == board.BLACK_KING:
+                kings -= 1
+            
+            # Продвижение к краю доски (для превращения в дамку)
+            if piece == board.WHITE:
+                advance += 7 - row  # Белые стремятся к верхнему краю (row = 0)
+            elif piece == board.BLACK:
+                advance -= row  # Черные стремятся к нижнему краю (row = 7)
+            
+            # Контроль центра доски
+            center_distance = abs(3.5 - row) + abs(3.5 - col)
+            if piece == board.WHITE or piece == board.WHITE_KING:
+                center += 4 - center_distance
+            else:
+                center -= 4 - center_distance
+    
+    # Возможности взятия
+    white_captures = len([move for move in board.get_all_possible_moves(board.WHITE) if len(move) > 4])
+    black_captures = len([move for move in board.get_all_possible_moves(board.BLACK) if len(move) > 4])
+    
+    return [board.white_count - board.black_count, kings, advance, center,
+            white_captures - black_captures]
+
+
 class AI:
     """Класс для реализации искусственного интеллекта в игре шашки"""
     
-    def __init__(self, board, difficulty=2):
+    # Режимы поиска
+    MINIMAX = 'minimax'
+    MCTS = 'mcts'
+    
+    def __init__(self, board, difficulty=2, mode=MINIMAX, player=None, weights=None, delay=1,
+                 time_limit=None, workers=1, tt=None, state_file=None, solver_pieces=6,
+                 solver_nodes=None, lmr=True, lmr_moves=3, lmr_depth=3, futility=True,
+                 futility_margin=None, extensions=False):
         """
         Инициализация ИИ
         
         Args:
             board: Текущее состояние игровой доски
             difficulty: Уровень сложности ИИ (1-3)
+            mode: Режим поиска: AI.MINIMAX (альфа-бета) или AI.MCTS (Монте-Карло)
+            player: Цвет, за который играет ИИ (по умолчанию белые)
+            weights: Веса оценочной функции (по умолчанию из weights.json)
+            delay: Задержка в секундах для имитации "размышления"
+            time_limit: Время на ход в режиме MCTS (по умолчанию 0.5 с на уровень сложности)
+            workers: Количество процессов для случайных партий в режиме MCTS
+            tt: Таблица транспозиций (TranspositionTable или SharedTranspositionTable);
+                по умолчанию создается собственная таблица
+            state_file: Файл сохраненного состояния, загружаемый при первом поиске
+                        (см. save_state); None - начинать без сохраненного состояния
+            solver_pieces: Если шашек на доске не больше этого числа, минимакс сначала
+                           пытается доказать выигрыш решателем df-pn (0 - не использовать)
+            solver_nodes: Бюджет решателя на ход (количество раскрытых позиций);
+                          по умолчанию SOLVER_NODES_PER_LEVEL на уровень сложности
+            lmr: Сокращать на один глубину поиска поздних тихих ходов
+            lmr_moves: Сколько первых ходов в позиции всегда ищутся на полную глубину
+            lmr_depth: Минимальная оставшаяся глубина для сокращения
+            futility: Пропускать у листьев тихие ходы, которые не могут изменить результат
+            futility_margin: Запас для такого отсечения (по умолчанию полторы шашки)
+            extensions: Не уменьшать глубину в позициях с единственным ходом
         """
+        if mode not in (self.MINIMAX, self.MCTS):
+            raise ValueError(f"Неизвестный режим поиска: {mode}")
         self.board = board
         self.difficulty = difficulty
         self.max_depth = self.difficulty * 2  # Глубина поиска зависит от сложности
-        self.player = board.WHITE  # ИИ всегда играет за белых
+        self.player = board.WHITE if player is None else player
+        self.opponent = board.BLACK if self.player == board.WHITE else board.WHITE
+        self.weights = get_weights() if weights is None else weights
+        self.delay = delay
+        self.tt = TranspositionTable() if tt is None else tt
+        self.history = {}     # Эвристика истории: ход (from, to) -> вес отсечений
+        self.eval_cache = {}  # Кеш оценок позиций по ключу таблицы транспозиций
+        self.state_file = state_file
+        self.nodes = 0        # Количество позиций, просмотренных минимаксом
+        # Количество ничьих по повторению позиции и ходам дамками, встреченных поиском:
+        # такие оценки зависят от истории партии, а не только от позиции
+        self.path_draws = 0
+        # Бюджет текущего поиска: предельное значение nodes и время окончания (см. search)
+        self.node_limit = float('inf')
+        self.deadline = float('inf')
+        self.solver_pieces = solver_pieces
+        self.solver_nodes = (SOLVER_NODES_PER_LEVEL * difficulty if solver_nodes is None
+                             else solver_nodes)
+        self.solver = None
+        # Количество шашек при последней неудачной попытке решателя: пока оно
+        # не изменится, решатель не запускается повторно
+        self.solver_failed_pieces = None
+        self.lmr = lmr
+        self.lmr_moves = lmr_moves
+        self.lmr_depth = lmr_depth
+        self.futility = futility
+        self.futility_margin = (1.5 * self.weights['piece'] if futility_margin is None
+                                else futility_margin)
+        self.extensions = extensions
+        # Счетчики выборочного поиска
+        self.stats = {'reductions': 0, 're_searches': 0, 'futility_pruned': 0, 'extensions': 0}
+        self.mode = mode
+        self.mcts = None
+        if mode == self.MCTS:
+            from mcts import MCTS
+            self.mcts = MCTS(time_limit if time_limit is not None else 0.5 * difficulty,
+                             workers=workers)
     
     def get_best_move(self):
         """
@@ -30,7 +246,8 @@ class AI:
             tuple: Координаты лучшего хода (from_row, from_col, to_row, to_col)
         """
         # Добавляем небольшую задержку для имитации "размышления"
-        time.sleep(1)
+        if self.delay:
+            time.sleep(self.delay)
         
         # Получаем все возможные ходы
         possible_moves = self.board.get_all_possible_moves(self.player)
@@ -42,45 +259,236 @@ class AI:
         if self.difficulty == 1:
             return self._choose_random_move(possible_moves)
         
+        # Поиск методом Монте-Карло (дерево сохраняется между ходами)
+        if self.mode == self.MCTS:
+            return self.mcts.search(self.board)[:4]
+        
+        # В позициях с малым количеством шашек пытаемся доказать выигрыш
+        pieces = self.board.white_count + self.board.black_count
+        if pieces <= self.solver_pieces and pieces != self.solver_failed_pieces:
+            winning_move = self._prove_win()
+            if winning_move is not None:
+                return winning_move
+            self.solver_failed_pieces = pieces
+        
         # Для средней и высокой сложности используем минимакс с разной глубиной
+        best_move, _ = self.search()
+        
+        # Если не нашли хороший ход, выбираем случайный
+        if best_move is None:
+            return self._choose_random_move(possible_moves)
+        
+        return best_move
+    
+    def _prove_win(self):
+        """
+        Поиск доказанно выигрывающего хода решателем df-pn
+        
+        Returns:
+            tuple или None: Первый ход выигрывающего варианта или None, если выигрыш
+                            не доказан в пределах бюджета
+        """
+        if self.solver is None:
+            from pns import ProofNumberSolver
+            self.solver = ProofNumberSolver(self.solver_nodes)
+        if self.solver.prove(self.board, self.player):
+            line = self.solver.principal_variation(self.board, self.player, max_length=1)
+            if line:
+                return line[0]
+        return None
+    
+    def search(self, depth=None, max_nodes=None, deadline=None):
+        """
+        Поиск лучшего хода минимаксом на заданную глубину
+        
+        Количество просмотренных позиций накапливается в атрибуте nodes.
+        
+        Args:
+            depth: Глубина поиска (по умолчанию max_depth)
+            max_nodes: Бюджет позиций на этот поиск (None - без ограничения)
+            deadline: Время окончания поиска по time.time() (None - без ограничения)
+            
+        Returns:
+            tuple: (лучший ход (from_row, from_col, to_row, to_col) или None, его оценка)
+            
+        Raises:
+            SearchAborted: Если бюджет исчерпан до окончания поиска
+        """
+        depth = self.max_depth if depth is None else depth
+        self._load_state_once()
+        self.node_limit = float('inf') if max_nodes is None else self.nodes + max_nodes
+        self.deadline = float('inf') if deadline is None else deadline
+        try:
+            return self._search_root(depth)
+        finally:
+            self.node_limit = float('inf')
+            self.deadline = float('inf')
+    
+    def _search_root(self, depth):
+        """Перебор ходов в корне для search"""
         best_move = None
         best_value = float('-inf')
         alpha = float('-inf')
         beta = float('inf')
         
+        key = self._tt_key(self.board)
+        entry = self.tt.probe(key)
+        possible_moves = self.board.get_all_possible_moves(self.player)
+        possible_moves = self._order_moves(possible_moves, entry[3] if entry else None)
+        path_draws = self.path_draws
+        
         for move in possible_moves:
             # Создаем копию доски для симуляции хода
             board_copy = self.board.clone()
             
             # Выполняем ход
-            if len(move) == 4:  # Обычный ход
-                from_row, from_col, to_row, to_col = move
-                board_copy.move_piece(from_row, from_col, to_row, to_col)
-                board_copy.switch_player()
-            else:  # Ход с взятием
-                from_row, from_col, to_row, to_col, capture_row, capture_col = move
-                board_copy.move_piece(from_row, from_col, to_row, to_col)
-                board_copy.remove_piece(capture_row, capture_col)
-                
-                # Проверяем, может ли шашка продолжить взятие
-                additional_captures = board_copy.get_piece_captures(to_row, to_col)
-                if not additional_captures:
-                    board_copy.switch_player()
+            board_copy.apply_move(move)
             
             # Оцениваем ход с помощью минимакса
-            value = self._minimax(board_copy, self.max_depth - 1, False, alpha, beta)
+            value = self._minimax(board_copy, depth - 1, alpha, beta)
             
             if value > best_value:
                 best_value = value
-                best_move = (from_row, from_col, to_row, to_col)
+                best_move = move[:4]
             
             alpha = max(alpha, best_value)
         
-        # Если не нашли хороший ход, выбираем случайный
-        if best_move is None:
-            return self._choose_random_move(possible_moves)
+        if best_move is not None:
+            self._store(key, depth, EXACT, best_value, best_move, path_draws)
+        return best_move, best_value
+    
+    def score_moves(self, board=None, depth=None):
+        """
+        Точная оценка каждого допустимого хода (для анализа и вывода нескольких вариантов)
         
-        return best_move
+        В отличие от get_best_move, каждый ход ищется с полным окном альфа-бета,
+        поэтому оценки всех ходов, а не только лучшего, точные.
+        
+        Args:
+            board: Позиция для анализа (по умолчанию доска ИИ); ходит игрок self.player
+            depth: Глубина поиска (по умолчанию max_depth)
+            
+        Returns:
+            list: Пары (ход (from_row, from_col, to_row, to_col), оценка) по убыванию оценки
+        """
+        board = self.board if board is None else board
+        depth = self.max_depth if depth is None else depth
+        self._load_state_once()
+        
+        key = self._tt_key(board)
+        entry = self.tt.probe(key)
+        possible_moves = board.get_all_possible_moves(self.player)
+        possible_moves = self._order_moves(possible_moves, entry[3] if entry else None)
+        
+        path_draws = self.path_draws
+        scored = []
+        for move in possible_moves:
+            board_copy = board.clone()
+            board_copy.apply_move(move)
+            value = self._minimax(board_copy, depth - 1, float('-inf'), float('inf'))
+            scored.append((move[:4], value))
+        
+        scored.sort(key=lambda item: item[1], reverse=True)
+        if scored:
+            self._store(key, depth, EXACT, scored[0][1], scored[0][0], path_draws)
+        return scored
+    
+    def _load_state_once(self):
+        """Загрузка сохраненного состояния при первом поиске"""
+        if self.state_file is not None:
+            path, self.state_file = self.state_file, None
+            self.load_state(path)
+    
+    def save_state(self, path=STATE_FILE, min_depth=2):
+        """
+        Сохранение накопленного состояния поиска в сжатый файл
+        
+        Сохраняются записи таблицы транспозиций с глубиной не меньше min_depth,
+        эвристика истории и кеш оценок. Файл содержит версию формата и отпечатки
+        правил (board.py) и весов оценочной функции.
+        
+        Args:
+            path: Путь к файлу
+            min_depth: Минимальная глубина сохраняемых записей таблицы транспозиций
+        """
+        self._load_state_once()
+        body = []
+        # Записи с нулевой глубиной зависят от истории партии (см. _store) и не сохраняются
+        entries = [(key, entry) for key, entry in self.tt.items() if entry[0] >= max(min_depth, 1)]
+        body.append(struct.pack('<I', len(entries)))
+        for key, (depth, flag, value, move) in entries:
+            move = _NO_MOVE if move is None else move[0] << 6 | move[1]
+            body.append(_TT_RECORD.pack(key, min(depth, 255), flag, value, move))
+        
+        body.append(struct.pack('<I', len(self.history)))
+        for move, score in self.history.items():
+            body.append(_HISTORY_RECORD.pack(move[0] << 6 | move[1], min(score, 0xFFFFFFFF)))
+        
+        body.append(struct.pack('<I', len(self.eval_cache)))
+        for key, value in self.eval_cache.items():
+            body.append(_EVAL_RECORD.pack(key, value))
+        
+        body = zlib.compress(b''.join(body))
+        header = _STATE_HEADER.pack(_STATE_MAGIC, STATE_VERSION, rules_fingerprint(),
+                                    weights_fingerprint(self.weights), len(body))
+        with open(path, 'wb') as f:
+            f.write(header + body)
+    
+    def load_state(self, path=STATE_FILE):
+        """
+        Загрузка состояния, сохраненного методом save_state
+        
+        Файл пропускается, если его нет, он поврежден или создан для другой
+        версии формата, других правил или других весов.
+        
+        Args:
+            path: Путь к файлу
+            
+        Returns:
+            bool: True, если состояние загружено
+        """
+        if not os.path.exists(path):
+            return False
+        with open(path, 'rb') as f:
+            data = f.read()
+        if len(data) < _STATE_HEADER.size:
+            return False
+        magic, version, rules, weights, length = _STATE_HEADER.unpack_from(data)
+        if (magic != _STATE_MAGIC or version != STATE_VERSION or rules != rules_fingerprint()
+                or weights != weights_fingerprint(self.weights)):
+            return False
+        try:
+            body = zlib.decompress(data[_STATE_HEADER.size:_STATE_HEADER.size + length])
+        except zlib.error:
+            return False
+        
+        offset = 0
+        
+        def records(record):
+            nonlocal offset
+            count = struct.unpack_from('<I', body, offset)[0]
+            offset += 4
+            for _ in range(count):
+                yield record.unpack_from(body, offset)
+                offset += record.size
+        
+        try:
+            for key, depth, flag, value, move in records(_TT_RECORD):
+                move = None if move == _NO_MOVE else (move >> 6, move & 63)
+                self.tt.store(key, depth, flag, value, move)
+            for move, score in records(_HISTORY_RECORD):
+                move = (move >> 6, move & 63)
+                self.history[move] = self.history.get(move, 0) + score
+            for key, value in records(_EVAL_RECORD):
+                self.eval_cache[key] = value
+        except struct.error:
+            return False
+        return True
+    
+    def close(self):
+        """Освобождение ресурсов поиска (рабочих процессов MCTS)"""
+        if self.mcts is not None:
+            self.mcts.close()
     
     def _choose_random_move(self, moves):
         """Выбор случайного хода из списка возможных"""
@@ -90,94 +498,221 @@ class AI:
         else:  # Ход с взятием
             return move[:4]  # Возвращаем только координаты хода без координат взятой шашки
     
-    def _minimax(self, board, depth, is_maximizing, alpha, beta):
+    def _tt_key(self, board):
+        """Ключ позиции в таблице транспозиций (оценки зависят от цвета ИИ)"""
+        return board.hash if self.player == board.WHITE else board.hash ^ _BLACK_AI_KEY
+    
+    @staticmethod
+    def _move_key(move):
+        """Компактная запись хода для таблицы транспозиций: пара клеток (from, to)"""
+        return (move[0] * 8 + move[1], move[2] * 8 + move[3])
+    
+    def _order_moves(self, moves, tt_move):
+        """
+        Упорядочивание ходов: сначала лучший ход из таблицы транспозиций,
+        затем остальные по убыванию веса в эвристике истории
+        """
+        history = self.history
+        move_key = self._move_key
+        
+        def priority(move):
+            key = move_key(move)
+            if key == tt_move:
+                return float('inf')
+            return history.get(key, 0)
+        
+        return sorted(moves, key=priority, reverse=True)
+    
+    def _record_cutoff(self, move, depth):
+        """Учет хода, вызвавшего отсечение, в эвристике истории"""
+        key = self._move_key(move)
+        self.history[key] = self.history.get(key, 0) + depth * depth
+    
+    def _store(self, key, depth, flag, value, move, path_draws):
+        """
+        Сохранение результата поиска в таблице транспозиций
+        
+        Если при поиске встретилась ничья по повторению или ходам дамками (счетчик
+        path_draws изменился), оценка верна только для пройденного пути: сохраняется
+        лишь лучший ход с нулевой глубиной, поэтому оценка не используется для
+        отсечений и не попадает в файл состояния.
+        """
+        if self.path_draws != path_draws:
+            depth = 0
+        self.tt.store(key, depth, flag, value, self._move_key(move) if move is not None else None)
+    
+    @staticmethod
+    def _is_quiet(board, move):
+        """Проверка, является ли ход тихим: без взятия и без превращения в дамку"""
+        if len(move) == 6:
+            return False
+        piece = board.get_piece(move[0], move[1])
+        return not (piece == board.WHITE and move[2] == 0 or piece == board.BLACK and move[2] == 7)
+    
+    def _reduce(self, quiet, index, depth):
+        """Нужно ли сократить глубину поиска для хода (сокращение поздних ходов)"""
+        if self.lmr and quiet and index >= self.lmr_moves and depth >= self.lmr_depth:
+            self.stats['reductions'] += 1
+            return True
+        return False
+    
+    def _minimax(self, board, depth, alpha, beta):
         """
         Алгоритм минимакс с альфа-бета отсечением для оценки ходов
         
+        Максимизирующий игрок определяется по очереди хода на доске, поэтому
+        продолжение многократного взятия остается за тем же игроком.
+        
+        Выборочный поиск (включается параметрами конструктора): поздние тихие ходы
+        ищутся на меньшую глубину с повторным поиском, если ход оказался лучше
+        ожидаемого; у листьев тихие ходы, не способные изменить результат с запасом
+        futility_margin, пропускаются; позиции с единственным ходом продлеваются.
+        
         Args:
             board: Текущее состояние доски
             depth: Текущая глубина поиска
-            is_maximizing: True, если текущий ход максимизирующего игрока (ИИ)
             alpha: Альфа значение для отсечения
             beta: Бета значение для отсечения
             
         Returns:
             float: Оценка позиции
         """
+        self.nodes += 1
+        
+        # Бюджет поиска: время проверяется раз в 1024 позиции
+        if self.nodes > self.node_limit or (not self.nodes & 1023 and time.time() > self.deadline):
+            raise SearchAborted()
+        
+        # Повторение позиции - ничья: дальнейший поиск только зациклится
+        if board.is_repetition():
+            self.path_draws += 1
+            return 0
+        
         # Базовый случай: достигнута максимальная глубина или игра окончена
         winner = board.get_winner()
         if depth == 0 or winner is not None:
+            if winner == board.DRAW:
+                self.path_draws += 1
             return self._evaluate_board(board)
         
-        current_player = self.player if is_maximizing else board.BLACK
-        possible_moves = board.get_all_possible_moves(current_player)
+        # Проверяем таблицу транспозиций
+        key = self._tt_key(board)
+        entry = self.tt.probe(key)
+        tt_move = None
+        if entry is not None:
+            entry_depth, flag, value, tt_move = entry
+            if entry_depth >= depth:
+                if flag == EXACT:
+                    return value
+                elif flag == LOWER:
+                    alpha = max(alpha, value)
+                else:
+                    beta = min(beta, value)
+                if beta <= alpha:
+                    return value
+        
+        is_maximizing = board.current_player == self.player
+        possible_moves = board.get_all_possible_moves(board.current_player)
         
         # Если нет ходов, позиция проигрышная
         if not possible_moves:
             return float('-inf') if is_maximizing else float('inf')
         
+        possible_moves = self._order_moves(possible_moves, tt_move)
+        alpha_orig, beta_orig = alpha, beta
+        best_move = None
+        path_draws = self.path_draws
+        
+        # Продление: единственный ход не уменьшает оставшуюся глубину
+        child_depth = depth - 1
+        if self.extensions and len(possible_moves) == 1:
+            child_depth = depth
+            self.stats['extensions'] += 1
+        
+        # Статическая оценка для отсечения бесперспективных ходов у листьев
+        static_eval = None
+        if self.futility and depth == 1:
+            static_eval = self._evaluate_board(board)
+        
         if is_maximizing:
-            max_eval = float('-inf')
-            for move in possible_moves:
+            best_eval = float('-inf')
+            for index, move in enumerate(possible_moves):
+                quiet = self._is_quiet(board, move)
+                
+                # Тихий ход не поднимет оценку выше альфы даже с запасом - пропускаем
+                if static_eval is not None and quiet and static_eval + self.futility_margin <= alpha:
+                    best_eval = max(best_eval, static_eval + self.futility_margin)
+                    self.stats['futility_pruned'] += 1
+                    continue
+                
                 # Создаем копию доски для симуляции хода
                 board_copy = board.clone()
                 
                 # Выполняем ход
-                if len(move) == 4:  # Обычный ход
-                    from_row, from_col, to_row, to_col = move
-                    board_copy.move_piece(from_row, from_col, to_row, to_col)
-                    board_copy.switch_player()
-                else:  # Ход с взятием
-                    from_row, from_col, to_row, to_col, capture_row, capture_col = move
-                    board_copy.move_piece(from_row, from_col, to_row, to_col)
-                    board_copy.remove_piece(capture_row, capture_col)
-                    
-                    # Проверяем, может ли шашка продолжить взятие
-                    additional_captures = board_copy.get_piece_captures(to_row, to_col)
-                    if not additional_captures:
-                        board_copy.switch_player()
+                board_copy.apply_move(move)
                 
-                # Рекурсивно оцениваем позицию
-                eval_value = self._minimax(board_copy, depth - 1, False, alpha, beta)
-                max_eval = max(max_eval, eval_value)
+                # Рекурсивно оцениваем позицию; поздние тихие ходы сначала ищем на меньшую глубину
+                if self._reduce(quiet, index, depth):
+                    eval_value = self._minimax(board_copy, child_depth - 1, alpha, beta)
+                    if eval_value > alpha:
+                        self.stats['re_searches'] += 1
+                        eval_value = self._minimax(board_copy, child_depth, alpha, beta)
+                else:
+                    eval_value = self._minimax(board_copy, child_depth, alpha, beta)
+                if eval_value > best_eval:
+                    best_eval = eval_value
+                    best_move = move
                 
                 # Альфа-бета отсечение
                 alpha = max(alpha, eval_value)
                 if beta <= alpha:
+                    self._record_cutoff(move, depth)
                     break
-                
-            return max_eval
         else:
-            min_eval = float('inf')
-            for move in possible_moves:
+            best_eval = float('inf')
+            for index, move in enumerate(possible_moves):
+                quiet = self._is_quiet(board, move)
+                
+                # Тихий ход не опустит оценку ниже беты даже с запасом - пропускаем
+                if static_eval is not None and quiet and static_eval - self.futility_margin >= beta:
+                    best_eval = min(best_eval, static_eval - self.futility_margin)
+                    self.stats['futility_pruned'] += 1
+                    continue
+                
                 # Создаем копию доски для симуляции хода
                 board_copy = board.clone()
                 
                 # Выполняем ход
-                if len(move) == 4:  # Обычный ход
-                    from_row, from_col, to_row, to_col = move
-                    board_copy.move_piece(from_row, from_col, to_row, to_col)
-                    board_copy.switch_player()
-                else:  # Ход с взятием
-                    from_row, from_col, to_row, to_col, capture_row, capture_col = move
-                    board_copy.move_piece(from_row, from_col, to_row, to_col)
-                    board_copy.remove_piece(capture_row, capture_col)
-                    
-                    # Проверяем, может ли шашка продолжить взятие
-                    additional_captures = board_copy.get_piece_captures(to_row, to_col)
-                    if not additional_captures:
-                        board_copy.switch_player()
+                board_copy.apply_move(move)
                 
-                # Рекурсивно оцениваем позицию
-                eval_value = self._minimax(board_copy, depth - 1, True, alpha, beta)
-                min_eval = min(min_eval, eval_value)
+                # Рекурсивно оцениваем позицию; поздние тихие ходы сначала ищем на меньшую глубину
+                if self._reduce(quiet, index, depth):
+                    eval_value = self._minimax(board_copy, child_depth - 1, alpha, beta)
+                    if eval_value < beta:
+                        self.stats['re_searches'] += 1
+                        eval_value = self._minimax(board_copy, child_depth, alpha, beta)
+                else:
+                    eval_value = self._minimax(board_copy, child_depth, alpha, beta)
+                if eval_value < best_eval:
+                    best_eval = eval_value
+                    best_move = move
                 
                 # Альфа-бета отсечение
                 beta = min(beta, eval_value)
                 if beta <= alpha:
+                    self._record_cutoff(move, depth)
                     break
-                
-            return min_eval
+        
+        # Сохраняем результат в таблице транспозиций
+        if best_eval <= alpha_orig:
+            flag = UPPER
+        elif best_eval >= beta_orig:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self._store(key, depth, flag, best_eval, best_move, path_draws)
+        
+        return best_eval
     
     def _evaluate_board(self, board):
         """
@@ -193,54 +728,24 @@ class AI:
         winner = board.get_winner()
         if winner == self.player:
             return 1000  # Выигрышная позиция для ИИ
+        elif winner == board.DRAW:
+            return 0  # Ничья
         elif winner is not None:
             return -1000  # Проигрышная позиция для ИИ
         
-        # Оцениваем позицию по количеству шашек и их расположению
-        score = 0
-        
-        # Ценность шашек
-        score += board.white_count * 10  # Обычные шашки ИИ
-        score -= board.black_count * 10  # Обычные шашки противника
-        
-        # Подсчитываем дамки
-        white_kings = 0
-        black_kings = 0
-        
-        for row in range(8):
-            for col in range(8):
-                piece = board.get_piece(row, col)
-                
-                if piece == board.WHITE_KING:
-                    white_kings += 1
-                    score += 15  # Дамки ценнее обычных шашек
-                elif piece == board.BLACK_KING:
-                    black_kings += 1
-                    score -= 15
-                
-                # Бонус за продвижение к краю доски (для превращения в дамку)
-                if piece == board.WHITE:
-                    score += (7 - row)  # Белые стремятся к верхнему краю (row = 0)
-                elif piece == board.BLACK:
-                    score -= row  # Черные стремятся к нижнему краю (row = 7)
-                
-                # Бонус за контроль центра доски
-                if piece != board.EMPTY:
-                    center_distance = abs(3.5 - row) + abs(3.5 - col)
-                    if piece == board.WHITE or piece == board.WHITE_KING:
-                        score += (4 - center_distance) * 0.5
-                    else:
-                        score -= (4 - center_distance) * 0.5
-        
-        # Бонус за наличие дамок
-        score += white_kings * 20
-        score -= black_kings * 20
-        
-        # Бонус за возможность взятия
-        white_captures = len([move for move in board.get_all_possible_moves(board.WHITE) if len(move) > 4])
-        black_captures = len([move for move in board.get_all_possible_moves(board.BLACK) if len(move) > 4])
+        # Проверяем кеш оценок
+        key = self._tt_key(board)
+        score = self.eval_cache.get(key)
+        if score is not None:
+            return score
         
-        score += white_captures * 5
-        score -= black_captures * 5
+        # Оцениваем позицию как взвешенную сумму признаков (с точки зрения белых)
+        features = extract_features(board)
+        score = sum(self.weights[name] * value for name, value in zip(FEATURES, features))
+        if self.player != board.WHITE:
+            score = -score
         
+        if len(self.eval_cache) >= EVAL_CACHE_SIZE:
+            self.eval_cache.clear()
+        self.eval_cache[key] = score
         return score
@@ -0,0 +1,109 @@
+"""
+Модуль анализа сыгранных партий
+
+Позиции партии анализируются в обратном порядке: поиск в конце партии
+заполняет общую таблицу транспозиций, и анализ более ранних позиций
+использует уже найденные результаты.
+"""
+
+import argparse
+
+from board import Board
+from ai import AI
+from transposition import TranspositionTable
+
+
+def replay(moves):
+    """
+    Воспроизведение партии на доске
+    
+    Args:
+        moves: Список ходов (from_row, from_col, to_row, to_col)
+        
+    Returns:
+        list: Позиции (объекты Board) перед каждым ходом
+        
+    Raises:
+        ValueError: Если ход недопустим
+    """
+    board = Board()
+    positions = []
+    for number, move in enumerate(moves, 1):
+        positions.append(board.clone())
+        if not board.make_move(*move):
+            raise ValueError(f"Недопустимый ход {number}: {' '.join(map(str, move))}")
+    return positions
+
+
+def analyse_game(moves, difficulty=3, multipv=1, blunder_threshold=15, tt=None):
+    """
+    Анализ партии: оценка каждого хода, лучший ход и отметки о грубых ошибках
+    
+    Результаты выдаются по мере готовности, начиная с последнего хода партии.
+    
+    Args:
+        moves: Список ходов (from_row, from_col, to_row, to_col)
+        difficulty: Уровень сложности ИИ, определяющий глубину поиска
+        multipv: Количество лучших ходов в результате
+        blunder_threshold: Потеря оценки по сравнению с лучшим ходом, считающаяся грубой ошибкой
+        tt: Таблица транспозиций (по умолчанию создается новая)
+        
+    Yields:
+        dict: Результат анализа позиции с ключами
+            'ply' - номер полухода (с 0), 'player' - игрок, сделавший ход,
+            'move' - сделанный ход, 'score' - его оценка для этого игрока,
+            'best_move' и 'best_score' - лучший ход и его оценка,
+            'blunder' - True, если ход хуже лучшего не меньше чем на blunder_threshold,
+            'top_moves' - multipv лучших ходов с оценками
+    """
+    moves = [tuple(move) for move in moves]
+    positions = replay(moves)
+    tt = TranspositionTable() if tt is None else tt
+    engines = {}
+    
+    for ply in reversed(range(len(moves))):
+        board = positions[ply]
+        player = board.current_player
+        if player not in engines:
+            engines[player] = AI(board, difficulty, player=player, delay=0, tt=tt)
+        scored = engines[player].score_moves(board)
+        
+        best_move, best_score = scored[0]
+        score = next(value for move, value in scored if move == moves[ply])
+        yield {
+            'ply': ply,
+            'player': player,
+            'move': moves[ply],
+            'score': score,
+            'best_move': best_move,
+            'best_score': best_score,
+            'blunder': best_score - score >= blunder_threshold,
+            'top_moves': scored[:multipv]
+        }
+
+
+def load_moves(path):
+    """Чтение ходов из файла: по одному ходу в строке в формате 'строка столбец строка столбец'"""
+    with open(path, encoding='utf-8') as f:
+        return [tuple(map(int, line.split())) for line in f if line.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Анализ сыгранной партии")
+    parser.add_argument('moves', help="файл с ходами партии")
+    parser.add_argument('--difficulty', type=int, default=3, help="уровень сложности (глубина поиска)")
+    parser.add_argument('--multipv', type=int, default=1, help="количество лучших ходов")
+    parser.add_argument('--blunder', type=float, default=15, help="порог грубой ошибки")
+    args = parser.parse_args()
+    
+    for result in analyse_game(load_moves(args.moves), args.difficulty, args.multipv, args.blunder):
+        player = "черные" if result['player'] == Board.BLACK else "белые"
+        move = ' '.join(map(str, result['move']))
+        mark = " ?? грубая ошибка" if result['blunder'] else ""
+        print(f"{result['ply'] + 1}. {player} {move}: {result['score']:+.1f}{mark}")
+        for best, value in result['top_moves']:
+            print(f"    {' '.join(map(str, best))}: {value:+.1f}")
+
+
+if __name__ == "__main__":
+    main()
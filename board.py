@@ -2,6 +2,15 @@
 Модуль для представления игровой доски и основных функций шашек
 """
 
+import random
+
+# Случайные ключи Зобриста для хеширования позиций: ZOBRIST[клетка][шашка].
+# Генератор инициализирован константой, чтобы ключи совпадали во всех процессах.
+_zobrist_rng = random.Random(20240607)
+ZOBRIST = [[_zobrist_rng.getrandbits(64) for _ in range(5)] for _ in range(64)]
+ZOBRIST_SIDE = _zobrist_rng.getrandbits(64)  # Ключ для хода белых
+
+
 class Board:
     """Класс для представления игровой доски в шашках"""
     
@@ -12,6 +21,13 @@ class Board:
     WHITE_KING = 3
     BLACK_KING = 4
     
+    # Результат партии "ничья" (get_winner возвращает цвет победителя или DRAW)
+    DRAW = 5
+    
+    # Правила ничьей в русских шашках
+    REPETITION_LIMIT = 3   # Троекратное повторение позиции
+    KING_MOVES_LIMIT = 30  # 15 ходов каждой стороны только дамками без взятий
+    
     # Символы для отображения в консоли
     SYMBOLS = {
         EMPTY: ' ',
@@ -29,7 +45,40 @@ class Board:
         self.current_player = self.BLACK  # Черные ходят первыми
         self.white_count = 12
         self.black_count = 12
+        self.hash = self.compute_hash()
+        self.reset_history()
+        self.invalidate_moves()
+        
+    def invalidate_moves(self):
+        """
+        Сброс кеша допустимых ходов
         
+        Вызывается при каждом изменении расстановки шашек; код, изменяющий
+        board напрямую, должен вызывать этот метод сам.
+        """
+        self._moves = {}       # Игрок -> список допустимых ходов
+        self._move_index = {}  # Игрок -> {(from_row, from_col, to_row, to_col): полный ход}
+    
+    def reset_history(self):
+        """
+        Сброс истории позиций для правил ничьей
+        
+        positions - хеши позиций после последнего необратимого хода (хода простой
+        шашкой или взятия), включая текущую; king_moves - количество ходов дамками
+        без взятий подряд.
+        """
+        self.positions = [self.hash]
+        self.king_moves = 0
+    
+    def is_repetition(self):
+        """Проверка, встречалась ли текущая позиция раньше в партии"""
+        return self.positions.count(self.hash) > 1
+    
+    def is_draw(self):
+        """Проверка ничьей по правилам повторения позиции и ходов только дамками"""
+        return (self.king_moves >= self.KING_MOVES_LIMIT or
+                self.positions.count(self.hash) >= self.REPETITION_LIMIT)
+    
     def setup_board(self):
         """Расстановка начальной позиции шашек на доске"""
         # Расставляем белые шашки (нижняя часть доски)
@@ -44,25 +93,50 @@ class Board:
                 if (row + col) % 2 == 1:  # Только на черных клетках
                     self.board[row][col] = self.BLACK
     
-    def display(self):
-        """Отображение текущего состояния доски в консоли"""
-        print("  0 1 2 3 4 5 6 7")  # Номера столбцов
-        print(" +-----------------+")
+    def compute_hash(self):
+        """
+        Вычисление хеша Зобриста для текущей позиции
         
+        Хеш поддерживается инкрементально при изменении доски (атрибут hash),
+        этот метод пересчитывает его полностью.
+        
+        Returns:
+            int: 64-битный хеш позиции с учетом очереди хода
+        """
+        key = ZOBRIST_SIDE if self.current_player == self.WHITE else 0
         for row in range(8):
-            print(f"{row}|", end="")  # Номер строки
             for col in range(8):
                 piece = self.board[row][col]
-                # Добавляем цветовое оформление для клеток доски
-                if (row + col) % 2 == 0:  # Белые клетки
-                    print(f"\033[47m {self.SYMBOLS[piece]} \033[0m", end="")
-                else:  # Черные клетки
-                    print(f"\033[40m {self.SYMBOLS[piece]} \033[0m", end="")
-            print("|")
-            
-        print(" +-----------------+")
-        print(f"Ход {'черных' if self.current_player == self.BLACK else 'белых'}")
-        print(f"Белых шашек: {self.white_count}, Черных шашек: {self.black_count}")
+                if piece != self.EMPTY:
+                    key ^= ZOBRIST[row * 8 + col][piece]
+        return key
+    
+    def cell_text(self, row, col):
+        """Текст клетки для консоли: символ шашки на фоне цвета клетки (ANSI)"""
+        if (row + col) % 2 == 0:  # Белые клетки
+            return f"\033[47m {self.SYMBOLS[self.board[row][col]]} \033[0m"
+        return f"\033[40m {self.SYMBOLS[self.board[row][col]]} \033[0m"  # Черные клетки
+    
+    def status_lines(self):
+        """Строки состояния игры под доской"""
+        return [
+            f"Ход {'черных' if self.current_player == self.BLACK else 'белых'}",
+            f"Белых шашек: {self.white_count}, Черных шашек: {self.black_count}"
+        ]
+    
+    def display_lines(self):
+        """Строки изображения доски в консоли вместе со строками состояния"""
+        lines = ["  0 1 2 3 4 5 6 7", " +-----------------+"]  # Номера столбцов
+        for row in range(8):
+            cells = ''.join(self.cell_text(row, col) for col in range(8))
+            lines.append(f"{row}|{cells}|")  # Номер строки
+        lines.append(" +-----------------+")
+        lines.extend(self.status_lines())
+        return lines
+    
+    def display(self):
+        """Отображение текущего состояния доски в консоли (кадр выводится одной записью)"""
+        print('\n'.join(self.display_lines()))
     
     def is_valid_position(self, row, col):
         """Проверка, находится ли позиция в пределах доски"""
@@ -96,11 +170,18 @@ class Board:
             self.board[row][col] = self.WHITE_KING
         elif piece == self.BLACK:
             self.board[row][col] = self.BLACK_KING
+        else:
+            return
+        self.hash ^= ZOBRIST[row * 8 + col][piece] ^ ZOBRIST[row * 8 + col][self.board[row][col]]
+        self.invalidate_moves()
     
     def move_piece(self, from_row, from_col, to_row, to_col):
         """Перемещение шашки с одной позиции на другую"""
-        self.board[to_row][to_col] = self.board[from_row][from_col]
+        piece = self.board[from_row][from_col]
+        self.board[to_row][to_col] = piece
         self.board[from_row][from_col] = self.EMPTY
+        self.invalidate_moves()
+        self.hash ^= ZOBRIST[from_row * 8 + from_col][piece] ^ ZOBRIST[to_row * 8 + to_col][piece]
         
         # Проверка на превращение в дамку
         if (to_row == 0 and self.board[to_row][to_col] == self.WHITE) or \
@@ -111,6 +192,9 @@ class Board:
         """Удаление шашки с доски"""
         piece = self.board[row][col]
         self.board[row][col] = self.EMPTY
+        if piece != self.EMPTY:
+            self.hash ^= ZOBRIST[row * 8 + col][piece]
+            self.invalidate_moves()
         
         # Обновляем счетчики шашек
         if piece == self.WHITE or piece == self.WHITE_KING:
@@ -121,6 +205,7 @@ class Board:
     def switch_player(self):
         """Переключение текущего игрока"""
         self.current_player = self.BLACK if self.current_player == self.WHITE else self.WHITE
+        self.hash ^= ZOBRIST_SIDE
     
     def get_winner(self):
         """Определение победителя, если игра завершена"""
@@ -133,10 +218,40 @@ class Board:
         if not self.get_all_possible_moves(self.current_player):
             return self.BLACK if self.current_player == self.WHITE else self.WHITE
         
+        # Проверка на ничью
+        if self.is_draw():
+            return self.DRAW
+        
         return None  # Игра продолжается
     
     def get_all_possible_moves(self, player):
-        """Получение всех возможных ходов для указанного игрока"""
+        """
+        Получение всех возможных ходов для указанного игрока
+        
+        Ходы вычисляются один раз для позиции и кешируются до следующего
+        изменения доски; возвращаемый список нельзя изменять.
+        """
+        moves = self._moves.get(player)
+        if moves is None:
+            moves = self._moves[player] = self._generate_moves(player)
+        return moves
+    
+    def legal_move(self, from_row, from_col, to_row, to_col):
+        """
+        Поиск допустимого хода текущего игрока по координатам
+        
+        Returns:
+            tuple или None: Полный ход (с координатами взятой шашки, если это взятие)
+                            или None, если ход недопустим
+        """
+        index = self._move_index.get(self.current_player)
+        if index is None:
+            moves = self.get_all_possible_moves(self.current_player)
+            index = self._move_index[self.current_player] = {move[:4]: move for move in moves}
+        return index.get((from_row, from_col, to_row, to_col))
+    
+    def _generate_moves(self, player):
+        """Генерация всех возможных ходов для указанного игрока"""
         moves = []
         captures = []  # Отдельный список для ходов с взятием
         
@@ -214,36 +329,117 @@ class Board:
     
     def make_move(self, from_row, from_col, to_row, to_col):
         """Выполнение хода с проверкой правил"""
-        # Получаем все возможные ходы для текущего игрока
-        possible_moves = self.get_all_possible_moves(self.current_player)
-        
         # Проверяем, является ли ход допустимым
-        for move in possible_moves:
-            if len(move) == 4:  # Обычный ход
-                if move == (from_row, from_col, to_row, to_col):
-                    self.move_piece(from_row, from_col, to_row, to_col)
-                    self.switch_player()
-                    return True
-            elif len(move) == 6:  # Ход с взятием
-                if move[:4] == (from_row, from_col, to_row, to_col):
-                    # Выполняем ход и удаляем взятую шашку
-                    self.move_piece(from_row, from_col, to_row, to_col)
-                    self.remove_piece(move[4], move[5])
-                    
-                    # Проверяем, может ли шашка продолжить взятие
-                    additional_captures = self.get_piece_captures(to_row, to_col)
-                    if not additional_captures:
-                        self.switch_player()
-                    
-                    return True
+        move = self.legal_move(from_row, from_col, to_row, to_col)
+        if move is None:
+            return False  # Недопустимый ход
+        
+        self.apply_move(move)
+        return True
+    
+    def apply_move(self, move):
+        """
+        Выполнение хода из списка get_all_possible_moves без проверки правил
+        
+        Args:
+            move: Обычный ход (from_row, from_col, to_row, to_col) или ход с взятием
+                  (from_row, from_col, to_row, to_col, capture_row, capture_col)
+        """
+        if len(move) == 4:  # Обычный ход
+            was_king = self.is_king(move[0], move[1])
+            self.move_piece(*move)
+            self.switch_player()
+            
+            # Ход дамкой без взятия обратим: продолжаем историю позиций
+            if was_king:
+                self.positions.append(self.hash)
+                self.king_moves += 1
+                return
+        else:  # Ход с взятием
+            from_row, from_col, to_row, to_col, capture_row, capture_col = move
+            self.move_piece(from_row, from_col, to_row, to_col)
+            self.remove_piece(capture_row, capture_col)
+            
+            # Проверяем, может ли шашка продолжить взятие
+            additional_captures = self.get_piece_captures(to_row, to_col)
+            if not additional_captures:
+                self.switch_player()
         
-        return False  # Недопустимый ход
+        # После хода простой шашкой или взятия прежние позиции повториться не могут
+        self.reset_history()
     
     def clone(self):
         """Создание копии текущего состояния доски"""
-        new_board = Board()
+        # Конструктор не вызывается: начальная расстановка и полный пересчет хеша
+        # были бы сразу перезаписаны
+        new_board = Board.__new__(Board)
         new_board.board = [row[:] for row in self.board]
         new_board.current_player = self.current_player
         new_board.white_count = self.white_count
         new_board.black_count = self.black_count
+        new_board.hash = self.hash
+        new_board.positions = self.positions[:]
+        new_board.king_moves = self.king_moves
+        new_board.invalidate_moves()
         return new_board
+    
+    # Символы текстового формата позиции
+    POSITION_CHARS = {
+        EMPTY: '.',
+        WHITE: 'w',
+        BLACK: 'b',
+        WHITE_KING: 'W',
+        BLACK_KING: 'B'
+    }
+    
+    def to_string(self):
+        """
+        Запись позиции в текстовом формате
+        
+        Формат: '<сторона>:<ряд0>/<ряд1>/.../<ряд7>', где сторона - 'W' или 'B',
+        а каждый ряд состоит из 8 символов ('.', 'w', 'b', 'W', 'B').
+        
+        Returns:
+            str: Текстовое представление позиции
+        """
+        side = 'W' if self.current_player == self.WHITE else 'B'
+        rows = [''.join(self.POSITION_CHARS[piece] for piece in row) for row in self.board]
+        return side + ':' + '/'.join(rows)
+    
+    @classmethod
+    def from_string(cls, text):
+        """
+        Создание доски из позиции в текстовом формате (см. to_string)
+        
+        Args:
+            text: Текстовое представление позиции
+            
+        Returns:
+            Board: Доска с заданной позицией
+            
+        Raises:
+            ValueError: Если строка не соответствует формату
+        """
+        pieces = {char: piece for piece, char in cls.POSITION_CHARS.items()}
+        try:
+            side, rows = text.strip().split(':')
+            rows = rows.split('/')
+        except ValueError:
+            raise ValueError(f"Некорректная позиция: {text!r}")
+        if side not in ('W', 'B') or len(rows) != 8 or any(len(row) != 8 for row in rows):
+            raise ValueError(f"Некорректная позиция: {text!r}")
+        
+        board = cls()
+        try:
+            board.board = [[pieces[char] for char in row] for row in rows]
+        except KeyError:
+            raise ValueError(f"Некорректная позиция: {text!r}")
+        board.current_player = cls.WHITE if side == 'W' else cls.BLACK
+        board.white_count = sum(1 for row in range(8) for col in range(8)
+                                if board.is_player_piece(row, col, cls.WHITE))
+        board.black_count = sum(1 for row in range(8) for col in range(8)
+                                if board.is_player_piece(row, col, cls.BLACK))
+        board.hash = board.compute_hash()
+        board.reset_history()
+        board.invalidate_moves()
+        return board
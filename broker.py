@@ -0,0 +1,317 @@
+"""
+Модуль распределенных игр ИИ против ИИ
+
+Координатор раздает задания (пакеты партий с настройками ИИ) рабочим
+процессам по TCP и собирает результаты в файл размеченных позиций
+в формате selfplay.py. Сообщения - строки JSON, по одному в строке.
+
+Задание, выданное рабочему, который отключился или не уложился в отведенное
+время, возвращается в очередь и выдается другому рабочему.
+
+Пример на одной машине:
+    python broker.py coordinator --games 100 --output positions.txt
+    python broker.py worker --processes 4
+"""
+
+import argparse
+import collections
+import io
+import json
+import multiprocessing
+import random
+import socket
+import socketserver
+import threading
+import time
+
+from selfplay import play_game
+
+DEFAULT_PORT = 5555
+
+
+def _send(stream, message):
+    """Отправка сообщения в виде строки JSON"""
+    stream.write(json.dumps(message, ensure_ascii=False) + '\n')
+    stream.flush()
+
+
+def _receive(stream):
+    """Получение сообщения; None, если соединение закрыто"""
+    line = stream.readline()
+    return json.loads(line) if line else None
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    """Обслуживание одного рабочего"""
+
+    def handle(self):
+        coordinator = self.server.coordinator
+        reader = io.TextIOWrapper(self.rfile, encoding='utf-8')
+        writer = io.TextIOWrapper(self.wfile, encoding='utf-8', write_through=True)
+        worker = f"{self.client_address[0]}:{self.client_address[1]}"
+        job = None
+        try:
+            while True:
+                message = _receive(reader)
+                if message is None:
+                    break
+                if message['type'] == 'result':
+                    coordinator.complete(message['id'], message['games'], worker)
+                    job = None
+                elif message['type'] == 'request':
+                    job = coordinator.take(worker)
+                    if job is None:
+                        _send(writer, {'type': 'done'})
+                        break
+                    _send(writer, dict(job, type='job'))
+        except (OSError, ValueError, KeyError):
+            pass  # Рабочий отключился или прислал некорректное сообщение
+        finally:
+            if job is not None:
+                coordinator.release(job['id'], worker)
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class Coordinator:
+    """Координатор: очередь заданий, выдача рабочим и сбор результатов"""
+
+    def __init__(self, jobs, output, host='127.0.0.1', port=DEFAULT_PORT, job_timeout=600):
+        """
+        Инициализация координатора
+
+        Args:
+            jobs: Список заданий (словари с ключами 'id', 'games', 'seed', 'settings')
+            output: Файл для размеченных позиций (дописывается в конец)
+            host: Адрес для подключения рабочих
+            port: Порт
+            job_timeout: Время в секундах, после которого задание выдается повторно
+        """
+        self.jobs = {job['id']: job for job in jobs}
+        self.pending = collections.deque(job['id'] for job in jobs)
+        self.in_flight = {}  # id задания -> (рабочий, крайний срок)
+        self.completed = set()
+        self.output = output
+        self.job_timeout = job_timeout
+        self.lock = threading.Condition()
+        self.games = 0
+        self.positions = 0
+        self.results = collections.Counter()
+        self.requeued = 0
+        self.start_time = None
+        self.server = _Server((host, port), _Handler)
+        self.server.coordinator = self
+
+    @property
+    def address(self):
+        """Адрес и порт, на которых координатор ждет рабочих"""
+        return self.server.server_address
+
+    @property
+    def finished(self):
+        """Все ли задания выполнены"""
+        return len(self.completed) == len(self.jobs)
+
+    def take(self, worker):
+        """
+        Выдача задания рабочему (ожидает, пока задания выполняются другими)
+
+        Returns:
+            dict или None: Задание; None, если все задания выполнены
+        """
+        with self.lock:
+            while True:
+                self._requeue_expired()
+                if self.pending:
+                    job_id = self.pending.popleft()
+                    self.in_flight[job_id] = (worker, time.time() + self.job_timeout)
+                    return self.jobs[job_id]
+                if self.finished:
+                    return None
+                self.lock.wait(1.0)
+
+    def complete(self, job_id, games, worker):
+        """Прием результатов задания (повторные результаты того же задания игнорируются)"""
+        with self.lock:
+            if job_id in self.completed:
+                return
+            self.completed.add(job_id)
+            self.in_flight.pop(job_id, None)
+            if job_id in self.pending:
+                self.pending.remove(job_id)
+            with open(self.output, 'a', encoding='utf-8') as f:
+                for game in games:
+                    f.writelines(f"{position} {game['result']}\n" for position in game['positions'])
+                    self.games += 1
+                    self.positions += len(game['positions'])
+                    self.results[game['result']] += 1
+            self.lock.notify_all()
+
+    def release(self, job_id, worker):
+        """Возврат в очередь задания рабочего, который отключился, не прислав результат"""
+        with self.lock:
+            owner = self.in_flight.get(job_id)
+            if owner is not None and owner[0] == worker:
+                del self.in_flight[job_id]
+                self.pending.appendleft(job_id)
+                self.requeued += 1
+                self.lock.notify_all()
+
+    def _requeue_expired(self):
+        """Возврат в очередь заданий, не выполненных за job_timeout (вызывается под блокировкой)"""
+        now = time.time()
+        for job_id, (worker, deadline) in list(self.in_flight.items()):
+            if deadline < now:
+                del self.in_flight[job_id]
+                self.pending.append(job_id)
+                self.requeued += 1
+
+    def report(self):
+        """Строка с ходом выполнения и суммарной производительностью"""
+        elapsed = max(time.time() - self.start_time, 1e-9)
+        return (f"Заданий {len(self.completed)}/{len(self.jobs)}, партий {self.games} "
+                f"({self.games / elapsed:.2f}/с), позиций {self.positions} "
+                f"({self.positions / elapsed:.1f}/с), повторных выдач {self.requeued}, "
+                f"результаты {dict(self.results)}")
+
+    def run(self, report_interval=5.0):
+        """Обслуживание рабочих до выполнения всех заданий"""
+        self.start_time = time.time()
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            with self.lock:
+                while not self.finished:
+                    self.lock.wait(report_interval)
+                    self._requeue_expired()
+                    print(self.report(), flush=True)
+        finally:
+            self.server.shutdown()
+            self.server.server_close()
+        print("Готово. " + self.report(), flush=True)
+
+
+def make_jobs(games, batch, settings, seed=None):
+    """
+    Разбиение партий на задания
+
+    Args:
+        games: Общее количество партий
+        batch: Количество партий в одном задании
+        settings: Параметры play_game (уровни сложности, режимы поиска и т. д.)
+        seed: Начальное значение для генерации зерен заданий
+
+    Returns:
+        list: Задания
+    """
+    rng = random.Random(seed)
+    jobs = []
+    for job_id, start in enumerate(range(0, games, batch)):
+        jobs.append({
+            'id': job_id,
+            'games': min(batch, games - start),
+            'seed': rng.getrandbits(32),
+            'settings': settings
+        })
+    return jobs
+
+
+def run_job(job):
+    """
+    Выполнение задания: проведение партий с заданными настройками
+
+    Returns:
+        list: Результаты партий: {'result': результат для белых, 'positions': позиции}
+    """
+    rng = random.Random(job['seed'])
+    games = []
+    for _ in range(job['games']):
+        positions, result = play_game(rng=rng, **job['settings'])
+        games.append({'result': result, 'positions': positions})
+    return games
+
+
+def run_worker(host='127.0.0.1', port=DEFAULT_PORT, retries=10):
+    """
+    Рабочий: запрашивает задания у координатора, пока они не закончатся
+
+    Args:
+        host: Адрес координатора
+        port: Порт координатора
+        retries: Количество попыток подключения (с паузой в секунду)
+
+    Returns:
+        int: Количество выполненных заданий
+    """
+    for attempt in range(retries):
+        try:
+            connection = socket.create_connection((host, port))
+            break
+        except OSError:
+            if attempt == retries - 1:
+                raise
+            time.sleep(1.0)
+
+    done = 0
+    with connection, connection.makefile('r', encoding='utf-8') as reader, \
+            connection.makefile('w', encoding='utf-8') as writer:
+        while True:
+            _send(writer, {'type': 'request'})
+            message = _receive(reader)
+            if message is None or message['type'] == 'done':
+                break
+            _send(writer, {'type': 'result', 'id': message['id'], 'games': run_job(message)})
+            done += 1
+    return done
+
+
+def _worker_process(args):
+    """Точка входа процесса-рабочего"""
+    return run_worker(*args)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Распределенные игры ИИ против ИИ")
+    subparsers = parser.add_subparsers(dest='role', required=True)
+
+    coordinator = subparsers.add_parser('coordinator', help="раздача заданий и сбор результатов")
+    coordinator.add_argument('--host', default='127.0.0.1', help="адрес для подключения рабочих")
+    coordinator.add_argument('--port', type=int, default=DEFAULT_PORT, help="порт")
+    coordinator.add_argument('--output', default='positions.txt', help="файл размеченных позиций")
+    coordinator.add_argument('--games', type=int, default=100, help="количество партий")
+    coordinator.add_argument('--batch', type=int, default=5, help="партий в одном задании")
+    coordinator.add_argument('--white', type=int, default=2, help="сложность ИИ за белых")
+    coordinator.add_argument('--black', type=int, default=2, help="сложность ИИ за черных")
+    coordinator.add_argument('--white-mode', default='minimax', help="режим поиска ИИ за белых")
+    coordinator.add_argument('--black-mode', default='minimax', help="режим поиска ИИ за черных")
+    coordinator.add_argument('--job-timeout', type=float, default=600, help="время на задание, с")
+    coordinator.add_argument('--seed', type=int, default=None, help="начальное значение генератора")
+
+    worker = subparsers.add_parser('worker', help="проведение партий по заданиям координатора")
+    worker.add_argument('--host', default='127.0.0.1', help="адрес координатора")
+    worker.add_argument('--port', type=int, default=DEFAULT_PORT, help="порт координатора")
+    worker.add_argument('--processes', type=int, default=1, help="количество рабочих процессов")
+
+    args = parser.parse_args()
+    if args.role == 'coordinator':
+        settings = {
+            'white_difficulty': args.white,
+            'black_difficulty': args.black,
+            'white_mode': args.white_mode,
+            'black_mode': args.black_mode
+        }
+        jobs = make_jobs(args.games, args.batch, settings, args.seed)
+        Coordinator(jobs, args.output, args.host, args.port, args.job_timeout).run()
+    elif args.processes > 1:
+        with multiprocessing.Pool(args.processes) as pool:
+            done = pool.map(_worker_process, [(args.host, args.port)] * args.processes)
+        print(f"Выполнено заданий: {sum(done)}")
+    else:
+        print(f"Выполнено заданий: {run_worker(args.host, args.port)}")
+
+
+if __name__ == "__main__":
+    main()
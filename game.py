@@ -14,6 +14,7 @@ class Game:
         self.game_over = False
         self.winner = None
         self.ai_mode = False
+        self.ai = None  # ИИ создается один раз, чтобы сохранять дерево поиска между ходами
     
     def start(self):
         """Запуск игрового цикла"""
@@ -43,9 +44,16 @@ class Game:
             else:
                 self.player_move()
         
+        # Сохраняем накопленное состояние ИИ для следующего запуска
+        if self.ai is not None:
+            from ai import STATE_FILE
+            self.ai.save_state(STATE_FILE)
+        
         # Отображаем результат игры
         self.board.display()
-        if self.winner == self.board.BLACK:
+        if self.winner == self.board.DRAW:
+            print("Игра окончена! Ничья.")
+        elif self.winner == self.board.BLACK:
             print("Игра окончена! Победили черные.")
         else:
             print("Игра окончена! Победили белые.")
@@ -97,11 +105,15 @@ class Game:
                     print("Вы можете перемещать только свои шашки.")
                     continue
                 
-                # Выполнение хода
-                if self.board.make_move(from_row, from_col, to_row, to_col):
-                    break
-                else:
+                # Проверка допустимости хода по кешу ходов позиции
+                move = self.board.legal_move(from_row, from_col, to_row, to_col)
+                if move is None:
                     print("Недопустимый ход. Попробуйте снова.")
+                    continue
+                
+                # Выполнение хода
+                self.board.apply_move(move)
+                break
             
             except ValueError:
                 print("Некорректный ввод. Используйте целые числа для координат.")
@@ -111,9 +123,10 @@ class Game:
         print("ИИ думает...")
         
         # Получаем ход от ИИ
-        from ai import AI
-        ai = AI(self.board)
-        from_row, from_col, to_row, to_col = ai.get_best_move()
+        if self.ai is None:
+            from ai import AI, STATE_FILE
+            self.ai = AI(self.board, state_file=STATE_FILE)
+        from_row, from_col, to_row, to_col = self.ai.get_best_move()
         
         print(f"ИИ ходит: {from_row} {from_col} -> {to_row} {to_col}")
         
@@ -0,0 +1,424 @@
+"""
+Модуль поиска по дереву методом Монте-Карло (MCTS с формулой UCT) для игры в шашки
+
+Случайные партии (playouts) разыгрываются на компактной копии доски -
+плоском списке из 64 клеток - по тем же правилам, что и в board.py,
+без создания объектов Board и списков ходов на каждом шаге.
+
+Из правил ничьей учитывается только правило ходов дамками: дамки ходят
+без взятия лишь в своих направлениях вперед, поэтому позиция после
+такого хода повториться не может.
+"""
+
+import math
+import multiprocessing
+import random
+import time
+
+from board import Board
+
+# Индексы служебных полей компактного состояния после 64 клеток доски
+SIDE = 64
+WHITE_COUNT = 65
+BLACK_COUNT = 66
+KING_MOVES = 67  # Ходы дамками без взятий подряд (как Board.king_moves)
+
+# Направления: вверх-влево, вверх-вправо, вниз-влево, вниз-вправо
+_DIRECTIONS = ((-1, -1), (-1, 1), (1, -1), (1, 1))
+_WHITE_DIRECTIONS = (0, 1)  # Белые двигаются вверх
+_BLACK_DIRECTIONS = (2, 3)  # Черные двигаются вниз
+_ALL_DIRECTIONS = (0, 1, 2, 3)
+
+# Соседняя клетка в каждом направлении (-1, если выходим за пределы доски)
+_NEIGHBOURS = tuple(
+    tuple((row + dr) * 8 + col + dc if 0 <= row + dr < 8 and 0 <= col + dc < 8 else -1
+          for dr, dc in _DIRECTIONS)
+    for row in range(8) for col in range(8)
+)
+
+# Черные клетки, на которых могут стоять шашки
+_DARK_SQUARES = tuple(row * 8 + col for row in range(8) for col in range(8) if (row + col) % 2 == 1)
+
+# Владелец шашки по ее коду (индекс - значение клетки Board)
+_OWNER = (Board.EMPTY, Board.WHITE, Board.BLACK, Board.WHITE, Board.BLACK)
+
+# Максимальное число ходов в одной позиции (с запасом)
+_MAX_MOVES = 256
+
+
+def state_from_board(board):
+    """Создание компактного состояния из объекта Board"""
+    state = [cell for row in board.board for cell in row]
+    state.extend((board.current_player, board.white_count, board.black_count, board.king_moves))
+    return state
+
+
+def encode_move(move):
+    """
+    Кодирование хода Board в целое число
+
+    Биты 0-5: клетка откуда, 6-11: клетка куда, 12 и выше: взятая клетка + 1 (0 - без взятия).
+    """
+    encoded = move[0] * 8 + move[1] | (move[2] * 8 + move[3]) << 6
+    if len(move) == 6:
+        encoded |= (move[4] * 8 + move[5] + 1) << 12
+    return encoded
+
+
+def decode_move(move):
+    """Преобразование закодированного хода в кортеж координат Board"""
+    from_square = move & 63
+    to_square = (move >> 6) & 63
+    decoded = (from_square >> 3, from_square & 7, to_square >> 3, to_square & 7)
+    captured = (move >> 12) - 1
+    if captured >= 0:
+        decoded += (captured >> 3, captured & 7)
+    return decoded
+
+
+def _piece_directions(piece):
+    """Направления хода без взятия для шашки (как в Board.get_piece_moves)"""
+    return _WHITE_DIRECTIONS if _OWNER[piece] == Board.WHITE else _BLACK_DIRECTIONS
+
+
+def _capture_directions(piece):
+    """Направления взятия для шашки (как в Board.get_piece_captures)"""
+    if piece == Board.WHITE_KING or piece == Board.BLACK_KING:
+        return _ALL_DIRECTIONS
+    return _piece_directions(piece)
+
+
+def _add_captures(state, square, opponent, buffer, count):
+    """Запись ходов с взятием для шашки на клетке square в буфер"""
+    for direction in _capture_directions(state[square]):
+        over = _NEIGHBOURS[square][direction]
+        if over < 0 or _OWNER[state[over]] != opponent:
+            continue
+        target = _NEIGHBOURS[over][direction]
+        if target >= 0 and state[target] == Board.EMPTY:
+            buffer[count] = square | target << 6 | (over + 1) << 12
+            count += 1
+    return count
+
+
+def generate_moves(state, buffer):
+    """
+    Запись всех допустимых ходов стороны, которая ходит, в буфер
+
+    Args:
+        state: Компактное состояние
+        buffer: Список длиной не меньше _MAX_MOVES для записи ходов
+
+    Returns:
+        int: Количество записанных ходов
+    """
+    player = state[SIDE]
+    opponent = Board.BLACK if player == Board.WHITE else Board.WHITE
+
+    # Сначала ищем взятия (обязательное взятие)
+    count = 0
+    for square in _DARK_SQUARES:
+        if _OWNER[state[square]] == player:
+            count = _add_captures(state, square, opponent, buffer, count)
+    if count:
+        return count
+
+    for square in _DARK_SQUARES:
+        piece = state[square]
+        if _OWNER[piece] != player:
+            continue
+        is_king = piece == Board.WHITE_KING or piece == Board.BLACK_KING
+        for direction in _piece_directions(piece):
+            target = _NEIGHBOURS[square][direction]
+            while target >= 0 and state[target] == Board.EMPTY:
+                buffer[count] = square | target << 6
+                count += 1
+                if not is_king:
+                    break
+                target = _NEIGHBOURS[target][direction]
+    return count
+
+
+def _has_capture(state, square):
+    """Проверка, может ли шашка на клетке square продолжить взятие"""
+    opponent = Board.BLACK if _OWNER[state[square]] == Board.WHITE else Board.WHITE
+    for direction in _capture_directions(state[square]):
+        over = _NEIGHBOURS[square][direction]
+        if over < 0 or _OWNER[state[over]] != opponent:
+            continue
+        target = _NEIGHBOURS[over][direction]
+        if target >= 0 and state[target] == Board.EMPTY:
+            return True
+    return False
+
+
+def apply_move(state, move):
+    """Выполнение закодированного хода на компактном состоянии (как Board.apply_move)"""
+    from_square = move & 63
+    to_square = (move >> 6) & 63
+    captured = (move >> 12) - 1
+
+    piece = state[from_square]
+    state[from_square] = Board.EMPTY
+
+    # Ход дамкой без взятия продолжает счет, ход простой шашкой или взятие его сбрасывают
+    if captured < 0 and (piece == Board.WHITE_KING or piece == Board.BLACK_KING):
+        state[KING_MOVES] += 1
+    else:
+        state[KING_MOVES] = 0
+
+    # Превращение в дамку
+    if piece == Board.WHITE and to_square < 8:
+        piece = Board.WHITE_KING
+    elif piece == Board.BLACK and to_square >= 56:
+        piece = Board.BLACK_KING
+    state[to_square] = piece
+
+    if captured >= 0:
+        if _OWNER[state[captured]] == Board.WHITE:
+            state[WHITE_COUNT] -= 1
+        else:
+            state[BLACK_COUNT] -= 1
+        state[captured] = Board.EMPTY
+
+        # Если шашка может продолжить взятие, ход остается за тем же игроком
+        if _has_capture(state, to_square):
+            return
+
+    state[SIDE] = Board.BLACK if state[SIDE] == Board.WHITE else Board.WHITE
+
+
+def _material_winner(state):
+    """Оценка незавершенной случайной партии по материалу (дамка - за три шашки)"""
+    balance = 0
+    for square in _DARK_SQUARES:
+        piece = state[square]
+        if piece == Board.WHITE:
+            balance += 1
+        elif piece == Board.WHITE_KING:
+            balance += 3
+        elif piece == Board.BLACK:
+            balance -= 1
+        elif piece == Board.BLACK_KING:
+            balance -= 3
+    if balance > 0:
+        return Board.WHITE
+    if balance < 0:
+        return Board.BLACK
+    return Board.EMPTY
+
+
+def playout(state, buffer, rng, max_plies=120):
+    """
+    Случайная партия из заданного состояния (состояние изменяется)
+
+    Args:
+        state: Компактное состояние (рабочая копия)
+        buffer: Буфер для ходов
+        rng: Генератор случайных чисел
+        max_plies: Максимальная длина партии, после которой победитель определяется по материалу
+
+    Returns:
+        int: Победитель (Board.WHITE, Board.BLACK) или Board.EMPTY при ничьей
+    """
+    for _ in range(max_plies):
+        if state[WHITE_COUNT] == 0:
+            return Board.BLACK
+        if state[BLACK_COUNT] == 0:
+            return Board.WHITE
+        count = generate_moves(state, buffer)
+        if count == 0:
+            return Board.BLACK if state[SIDE] == Board.WHITE else Board.WHITE
+        if state[KING_MOVES] >= Board.KING_MOVES_LIMIT:
+            return Board.EMPTY
+        apply_move(state, buffer[int(rng.random() * count)])
+    return _material_winner(state)
+
+
+class _Node:
+    """Узел дерева поиска"""
+
+    __slots__ = ('move', 'parent', 'player', 'children', 'untried', 'visits', 'wins')
+
+    def __init__(self, move, parent, player, untried):
+        self.move = move          # Ход, ведущий в этот узел
+        self.parent = parent
+        self.player = player      # Игрок, сделавший этот ход
+        self.children = []
+        self.untried = untried    # Еще не раскрытые ходы
+        self.visits = 0
+        self.wins = 0.0           # Сумма результатов для игрока self.player
+
+
+def _search(root, root_state, deadline, iterations, exploration, rng):
+    """Итерации MCTS от корня до истечения времени или числа итераций"""
+    state = list(root_state)
+    buffer = [0] * _MAX_MOVES
+    log = math.log
+    sqrt = math.sqrt
+    done = 0
+
+    while done < iterations and (done & 15 or time.time() < deadline):
+        done += 1
+        node = root
+        state[:] = root_state
+
+        # Выбор: спускаемся по полностью раскрытым узлам по формуле UCT
+        while not node.untried and node.children:
+            log_visits = log(node.visits)
+            best_value = -1.0
+            for child in node.children:
+                value = child.wins / child.visits + exploration * sqrt(log_visits / child.visits)
+                if value > best_value:
+                    best_value = value
+                    node = child
+            apply_move(state, node.move)
+
+        # Расширение: добавляем один новый ход
+        if node.untried:
+            move = node.untried.pop(int(rng.random() * len(node.untried)))
+            player = state[SIDE]
+            apply_move(state, move)
+            count = _expandable_moves(state, buffer)
+            child = _Node(move, node, player, buffer[:count])
+            node.children.append(child)
+            node = child
+
+        # Случайная партия
+        winner = playout(state, buffer, rng)
+
+        # Обратное распространение результата
+        while node is not None:
+            node.visits += 1
+            if winner == node.player:
+                node.wins += 1.0
+            elif winner == Board.EMPTY:
+                node.wins += 0.5
+            node = node.parent
+
+    return done
+
+
+def _expandable_moves(state, buffer):
+    """Запись ходов для раскрытия узла (в позиции с ничьей по правилам ходов нет)"""
+    if state[KING_MOVES] >= Board.KING_MOVES_LIMIT:
+        return 0
+    return generate_moves(state, buffer)
+
+
+def _new_root(state):
+    """Создание корня дерева для заданного состояния"""
+    buffer = [0] * _MAX_MOVES
+    count = generate_moves(state, buffer)
+    return _Node(None, None, None, buffer[:count])
+
+
+def _worker_search(args):
+    """Независимый поиск в отдельном процессе; возвращает посещения ходов корня"""
+    state, time_limit, iterations, exploration, seed = args
+    root = _new_root(state)
+    _search(root, state, time.time() + time_limit, iterations, exploration, random.Random(seed))
+    return {child.move: child.visits for child in root.children}
+
+
+class MCTS:
+    """Поиск лучшего хода методом Монте-Карло с повторным использованием дерева"""
+
+    def __init__(self, time_limit=1.0, iterations=None, exploration=1.4, workers=1, seed=None):
+        """
+        Инициализация поиска
+
+        Args:
+            time_limit: Время на ход в секундах
+            iterations: Ограничение числа итераций (None - только по времени)
+            exploration: Коэффициент исследования в формуле UCT
+            workers: Количество процессов (больше 1 - параллельный поиск от корня)
+            seed: Начальное значение генератора случайных чисел
+        """
+        self.time_limit = time_limit
+        self.iterations = iterations if iterations is not None else float('inf')
+        self.exploration = exploration
+        self.workers = workers
+        self.rng = random.Random(seed)
+        self.root = None
+        self.root_state = None
+        self.pool = None
+        self.last_iterations = 0
+
+    def _reuse_tree(self, state, max_depth=4):
+        """
+        Поиск в старом дереве узла с текущей позицией
+
+        Просматриваются узлы на глубине до max_depth полуходов от прежнего корня
+        (свой ход, ответ противника и продолжения взятий). Состояния сравниваются
+        вместе со счетчиком ходов дамками, от которого зависит ничья.
+
+        Returns:
+            _Node или None: Найденный узел
+        """
+        if self.root is None:
+            return None
+        level = [(self.root, self.root_state)]
+        for _ in range(max_depth):
+            next_level = []
+            for node, node_state in level:
+                for child in node.children:
+                    child_state = list(node_state)
+                    apply_move(child_state, child.move)
+                    if child_state == state:
+                        return child
+                    next_level.append((child, child_state))
+            level = next_level
+        return None
+
+    def search(self, board):
+        """
+        Поиск лучшего хода для текущего игрока
+
+        Args:
+            board: Текущее состояние доски
+
+        Returns:
+            tuple или None: Лучший ход в формате get_all_possible_moves
+        """
+        state = state_from_board(board)
+        root = self._reuse_tree(state)
+        if root is None:
+            root = _new_root(state)
+        root.parent = None
+        root.move = None
+        self.root = root
+        self.root_state = state
+
+        if not root.untried and not root.children:
+            return None  # Нет доступных ходов
+
+        deadline = time.time() + self.time_limit
+
+        # Параллельный поиск: дополнительные процессы строят независимые деревья
+        pending = None
+        if self.workers > 1:
+            if self.pool is None:
+                self.pool = multiprocessing.Pool(self.workers - 1)
+            tasks = [(state, self.time_limit, self.iterations, self.exploration, self.rng.random())
+                     for _ in range(self.workers - 1)]
+            pending = self.pool.map_async(_worker_search, tasks)
+
+        self.last_iterations = _search(root, state, deadline, self.iterations, self.exploration, self.rng)
+
+        # Суммируем посещения ходов корня по всем деревьям
+        visits = {child.move: child.visits for child in root.children}
+        if pending is not None:
+            for worker_visits in pending.get():
+                for move, count in worker_visits.items():
+                    visits[move] = visits.get(move, 0) + count
+
+        if not visits:
+            return decode_move(root.untried[0])
+        return decode_move(max(visits, key=visits.get))
+
+    def close(self):
+        """Завершение рабочих процессов"""
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool = None
@@ -0,0 +1,273 @@
+"""
+Модуль доказательства выигрыша и проигрыша поиском по числам доказательства
+
+Используется вариант df-pn (поиск в глубину по числам доказательства
+и опровержения) с таблицей транспозиций. В отличие от минимакса с
+эвристической оценкой, решатель либо доказывает результат позиции
+с точностью, либо сообщает, что результат неизвестен в пределах бюджета.
+
+Результат позиции зависит не только от расстановки, но и от правил ничьей,
+поэтому ключ таблицы включает счетчик ходов дамками. Повторение позиции
+из истории партии или текущего пути считается ничьей; опровержения,
+полученные через такое повторение, зависят от пути и в таблицу не
+записываются (проблема взаимодействия с историей, GHI).
+"""
+
+import argparse
+
+from board import Board
+
+# Результаты решения с точки зрения игрока, который ходит в корневой позиции
+WIN = 'win'
+LOSS = 'loss'
+DRAW = 'draw'
+UNKNOWN = 'unknown'
+
+INFINITY = 10 ** 9
+
+
+class _BudgetExceeded(Exception):
+    """Исчерпан бюджет решателя"""
+
+
+class ProofNumberSolver:
+    """Решатель позиций методом df-pn"""
+
+    def __init__(self, max_nodes=100000, max_entries=1000000):
+        """
+        Инициализация решателя
+
+        Args:
+            max_nodes: Бюджет одного вызова solve или prove (количество раскрытых позиций)
+            max_entries: Максимальное количество записей в таблице транспозиций
+        """
+        self.max_nodes = max_nodes
+        self.max_entries = max_entries
+        self.table = {}
+        self.distances = {}  # Ключ доказанной позиции -> количество полуходов до выигрыша
+        self.nodes = 0
+        self.node_limit = max_nodes
+        self.attacker = None
+
+    def solve(self, board):
+        """
+        Решение позиции для игрока, который ходит
+
+        Бюджет max_nodes общий для доказательства выигрыша и проигрыша.
+
+        Args:
+            board: Позиция (не изменяется)
+
+        Returns:
+            tuple: (WIN, LOSS, DRAW или UNKNOWN; выигрывающий вариант - список ходов
+                    (from_row, from_col, to_row, to_col) для WIN и LOSS, иначе пустой список)
+        """
+        player = board.current_player
+        opponent = Board.BLACK if player == Board.WHITE else Board.WHITE
+
+        proven = self.prove(board, player)
+        if proven is True:
+            return WIN, self.principal_variation(board, player)
+        if proven is None:
+            return UNKNOWN, []
+
+        # Выигрыш не доказуем: проверяем, не выигрывает ли соперник, в пределах остатка бюджета
+        used = self.nodes
+        proven = self.prove(board, opponent, self.max_nodes - used)
+        self.nodes += used
+        if proven is True:
+            return LOSS, self.principal_variation(board, opponent)
+        if proven is None:
+            return UNKNOWN, []
+        return DRAW, []
+
+    def prove(self, board, attacker, max_nodes=None):
+        """
+        Доказательство выигрыша игрока attacker
+
+        Args:
+            board: Позиция (не изменяется)
+            attacker: Игрок, выигрыш которого доказывается
+            max_nodes: Бюджет этого вызова (по умолчанию self.max_nodes)
+
+        Returns:
+            bool или None: True - выигрыш доказан, False - опровергнут, None - бюджет исчерпан
+                           или опровержение держится только на повторении позиции
+        """
+        self.attacker = attacker
+        self.table = {}
+        self.distances = {}
+        self.nodes = 0
+        self.node_limit = self.max_nodes if max_nodes is None else max_nodes
+        try:
+            # Позиции из истории партии считаются уже пройденными
+            proof, disproof, dependent = self._mid(board, INFINITY, INFINITY, set(board.positions))
+        except _BudgetExceeded:
+            return None
+        if proof == 0:
+            return True
+        if disproof == 0 and not dependent:
+            return False
+        return None
+
+    def principal_variation(self, board, attacker, max_length=100):
+        """
+        Выигрывающий вариант по доказанным позициям таблицы транспозиций
+
+        Атакующий выбирает доказанный ход, ведущий к самому быстрому выигрышу,
+        защищающийся - ход, дольше всего откладывающий проигрыш.
+        """
+        self.attacker = attacker
+        line = []
+        board = board.clone()
+        while len(line) < max_length and board.get_winner() is None:
+            best = None
+            sign = 1 if board.current_player == attacker else -1
+            for move, child in self._children(board):
+                if self._lookup(child)[0] != 0:
+                    continue
+                distance = self._distance(child)
+                if best is None or sign * distance < sign * best[2]:
+                    best = (move, child, distance)
+            if best is None:
+                break
+            line.append(best[0][:4])
+            board = best[1]
+        return line
+
+    def _key(self, board):
+        """Ключ позиции в таблице (результат зависит от атакующего игрока и счетчика ходов дамками)"""
+        return (board.hash, board.king_moves, self.attacker)
+
+    def _lookup(self, board):
+        """Числа доказательства и опровержения позиции"""
+        entry = self.table.get(self._key(board))
+        if entry is not None:
+            return entry
+        winner = board.get_winner()
+        if winner == self.attacker:
+            return 0, INFINITY
+        if winner is not None:
+            return INFINITY, 0  # Проигрыш или ничья - выигрыш опровергнут
+        return 1, 1
+
+    def _distance(self, board):
+        """Количество полуходов до выигрыша из доказанной позиции (0 - игра окончена)"""
+        return self.distances.get(self._key(board), 0)
+
+    def _store(self, board, proof, disproof):
+        """Сохранение чисел позиции в таблице транспозиций"""
+        if len(self.table) >= self.max_entries:
+            raise _BudgetExceeded()
+        self.table[self._key(board)] = (proof, disproof)
+
+    @staticmethod
+    def _children(board):
+        """Дочерние позиции: пары (ход, доска после хода)"""
+        children = []
+        for move in board.get_all_possible_moves(board.current_player):
+            child = board.clone()
+            child.apply_move(move)
+            children.append((move, child))
+        return children
+
+    def _mid(self, board, proof_threshold, disproof_threshold, path):
+        """
+        Раскрытие позиции, пока ее числа не превысят пороги
+
+        Returns:
+            tuple: Числа доказательства и опровержения позиции и признак того,
+                   что опровержение верно только для текущего пути
+        """
+        proof, disproof = self._lookup(board)
+        if proof == 0 or disproof == 0:
+            return proof, disproof, False
+
+        self.nodes += 1
+        if self.nodes > self.node_limit:
+            raise _BudgetExceeded()
+
+        is_or = board.current_player == self.attacker
+        children = self._children(board)
+        path.add(board.hash)
+        local = {}  # Индекс дочерней позиции -> опровержение, зависящее от пути
+
+        while True:
+            # Числа позиции по дочерним позициям; повтор позиции на пути - ничья
+            numbers = []
+            for index, (move, child) in enumerate(children):
+                if child.hash in path:
+                    local[index] = (INFINITY, 0)
+                numbers.append(local[index] if index in local else self._lookup(child))
+
+            if is_or:
+                proof = min(number[0] for number in numbers)
+                disproof = min(INFINITY, sum(number[1] for number in numbers))
+            else:
+                proof = min(INFINITY, sum(number[0] for number in numbers))
+                disproof = min(number[1] for number in numbers)
+
+            if proof >= proof_threshold or disproof >= disproof_threshold:
+                break
+
+            # Выбор наиболее перспективной дочерней позиции и порогов для нее
+            index = self._select(numbers, is_or)
+            child_proof, child_disproof = numbers[index]
+            second = sorted(number[0 if is_or else 1] for number in numbers)
+            second = second[1] if len(second) > 1 else INFINITY
+            if is_or:
+                child_proof_threshold = min(proof_threshold, second + 1)
+                child_disproof_threshold = disproof_threshold - disproof + child_disproof
+            else:
+                child_proof_threshold = proof_threshold - proof + child_proof
+                child_disproof_threshold = min(disproof_threshold, second + 1)
+
+            child_proof, child_disproof, child_dependent = self._mid(
+                children[index][1], child_proof_threshold, child_disproof_threshold, path)
+            if child_dependent:
+                local[index] = (child_proof, child_disproof)
+
+        path.discard(board.hash)
+
+        # Опровержение зависит от пути, если без зависящих от пути дочерних позиций его нет:
+        # в узле OR опровергнуты все дочерние позиции, в узле AND - хотя бы одна
+        dependent = False
+        if disproof == 0 and local:
+            if is_or:
+                dependent = True
+            else:
+                dependent = all(index in local for index, number in enumerate(numbers) if number[1] == 0)
+        if not dependent:
+            self._store(board, proof, disproof)
+        if proof == 0:
+            # Атакующий выбирает самый быстрый выигрыш, защищающийся - самый долгий
+            distances = [self._distance(child) for (move, child), number in zip(children, numbers)
+                         if number[0] == 0]
+            self.distances[self._key(board)] = 1 + (min(distances) if is_or else max(distances))
+        return proof, disproof, dependent
+
+    @staticmethod
+    def _select(numbers, is_or):
+        """Индекс дочерней позиции с наименьшим числом доказательства (OR) или опровержения (AND)"""
+        position = 0 if is_or else 1
+        return min(range(len(numbers)), key=lambda index: numbers[index][position])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Доказательство результата позиции методом df-pn")
+    parser.add_argument('position', help="позиция в формате Board.to_string")
+    parser.add_argument('--nodes', type=int, default=100000, help="бюджет раскрытых позиций")
+    args = parser.parse_args()
+
+    board = Board.from_string(args.position)
+    solver = ProofNumberSolver(args.nodes)
+    result, line = solver.solve(board)
+    names = {WIN: "выигрыш", LOSS: "проигрыш", DRAW: "ничья", UNKNOWN: "неизвестно"}
+    print(f"Результат для {'белых' if board.current_player == Board.WHITE else 'черных'}: "
+          f"{names[result]} (раскрыто позиций: {solver.nodes})")
+    if line:
+        print("Вариант: " + ", ".join(' '.join(map(str, move)) for move in line))
+
+
+if __name__ == "__main__":
+    main()
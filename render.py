@@ -0,0 +1,97 @@
+"""
+Модуль вывода доски в консоль для режима наблюдения за партиями
+
+Каждый кадр собирается в один буфер и выводится одной записью. В режиме
+DIFF после первого кадра перерисовываются только изменившиеся клетки
+(с позиционированием курсора), в режиме NONE ничего не форматируется.
+Частота кадров ограничивается: слишком частые кадры пропускаются.
+"""
+
+import sys
+import time
+
+# Положение доски на экране (строки и столбцы терминала считаются с 1)
+_FIRST_ROW_LINE = 3    # Строка терминала с рядом 0 доски
+_FIRST_CELL_COLUMN = 3  # Столбец терминала с первой клеткой ряда ("0|" занимает два символа)
+_CELL_WIDTH = 3
+_STATUS_LINE = _FIRST_ROW_LINE + 9  # Первая строка состояния (после нижней рамки)
+
+
+class ConsoleRenderer:
+    """Буферизованный вывод доски с перерисовкой только изменений"""
+
+    FULL = 'full'  # Каждый кадр выводится целиком
+    DIFF = 'diff'  # Выводятся только изменившиеся клетки
+    NONE = 'none'  # Вывод отключен
+
+    def __init__(self, mode=DIFF, max_fps=30, stream=None):
+        """
+        Инициализация вывода
+
+        Args:
+            mode: Режим вывода (FULL, DIFF или NONE)
+            max_fps: Максимальная частота кадров (None - без ограничения)
+            stream: Поток вывода (по умолчанию sys.stdout)
+        """
+        if mode not in (self.FULL, self.DIFF, self.NONE):
+            raise ValueError(f"Неизвестный режим вывода: {mode}")
+        self.mode = mode
+        self.min_interval = 1.0 / max_fps if max_fps else 0.0
+        self.stream = stream if stream is not None else sys.stdout
+        self.last_time = None
+        self.cells = None   # Клетки последнего выведенного кадра
+        self.status = None  # Строки состояния последнего кадра
+        self.frames = 0     # Количество выведенных кадров
+        self.skipped = 0    # Количество пропущенных кадров
+
+    def render(self, board, force=False):
+        """
+        Вывод кадра с текущей позицией
+
+        Args:
+            board: Доска для отображения
+            force: Вывести кадр без учета ограничения частоты (например, последний кадр)
+
+        Returns:
+            bool: True, если кадр был выведен
+        """
+        if self.mode == self.NONE:
+            return False
+
+        now = time.monotonic()
+        if not force and self.last_time is not None and now - self.last_time < self.min_interval:
+            self.skipped += 1
+            return False
+        self.last_time = now
+
+        cells = [row[:] for row in board.board]
+        status = board.status_lines()
+        if self.mode == self.FULL or self.cells is None:
+            frame = "\033[H\033[2J" + '\n'.join(board.display_lines()) + '\n'  # Очистка экрана и вся доска
+        else:
+            frame = self._diff_frame(board, cells, status)
+        self.cells = cells
+        self.status = status
+
+        self.stream.write(frame)
+        self.stream.flush()
+        self.frames += 1
+        return True
+
+    def _diff_frame(self, board, cells, status):
+        """Кадр из изменившихся клеток и строк состояния с позиционированием курсора"""
+        parts = []
+        for row in range(8):
+            old_row = self.cells[row]
+            new_row = cells[row]
+            for col in range(8):
+                if old_row[col] != new_row[col]:
+                    line = _FIRST_ROW_LINE + row
+                    column = _FIRST_CELL_COLUMN + col * _CELL_WIDTH
+                    parts.append(f"\033[{line};{column}H{board.cell_text(row, col)}")
+        for index, line in enumerate(status):
+            if self.status[index] != line:
+                parts.append(f"\033[{_STATUS_LINE + index};1H{line}\033[K")
+        # Курсор под доской, чтобы последующий вывод не портил кадр
+        parts.append(f"\033[{_STATUS_LINE + len(status)};1H")
+        return ''.join(parts)
@@ -0,0 +1,103 @@
+"""
+Модуль игр ИИ против ИИ для сбора обучающих позиций
+"""
+
+import argparse
+import random
+
+from board import Board
+from ai import AI
+from render import ConsoleRenderer
+
+
+def play_game(white_difficulty=2, black_difficulty=2, random_plies=4, max_plies=200, rng=None,
+              white_mode=AI.MINIMAX, black_mode=AI.MINIMAX, time_limit=None, renderer=None):
+    """
+    Проведение одной партии ИИ против ИИ
+    
+    Args:
+        white_difficulty: Уровень сложности ИИ за белых
+        black_difficulty: Уровень сложности ИИ за черных
+        random_plies: Количество случайных ходов в начале партии (для разнообразия)
+        max_plies: Максимальное количество полуходов (страховка; ничьи определяет Board.get_winner)
+        rng: Генератор случайных чисел
+        white_mode: Режим поиска ИИ за белых (AI.MINIMAX или AI.MCTS)
+        black_mode: Режим поиска ИИ за черных
+        time_limit: Время на ход в режиме MCTS
+        renderer: ConsoleRenderer для наблюдения за партией (None - без вывода)
+        
+    Returns:
+        tuple: (список позиций в текстовом формате, результат с точки зрения белых:
+                1 - победа, 0.5 - ничья, 0 - поражение)
+    """
+    rng = rng or random.Random()
+    board = Board()
+    players = {
+        Board.WHITE: AI(board, white_difficulty, white_mode, player=Board.WHITE, delay=0,
+                        time_limit=time_limit),
+        Board.BLACK: AI(board, black_difficulty, black_mode, player=Board.BLACK, delay=0,
+                        time_limit=time_limit)
+    }
+    positions = []
+    
+    try:
+        for ply in range(max_plies):
+            if renderer is not None:
+                renderer.render(board)
+            winner = board.get_winner()
+            if winner == Board.DRAW:
+                return positions, 0.5
+            if winner is not None:
+                return positions, 1 if winner == Board.WHITE else 0
+            
+            positions.append(board.to_string())
+            if ply < random_plies:
+                move = rng.choice(board.get_all_possible_moves(board.current_player))[:4]
+            else:
+                move = players[board.current_player].get_best_move()
+            board.make_move(*move)
+        
+        return positions, 0.5
+    finally:
+        if renderer is not None:
+            renderer.render(board, force=True)
+        for ai in players.values():
+            ai.close()
+
+
+def generate_positions(path, games, white_difficulty=2, black_difficulty=2, seed=None, renderer=None):
+    """
+    Генерация файла размеченных позиций для настройки весов
+    
+    Каждая строка файла: '<позиция> <результат партии>'.
+    
+    Args:
+        path: Путь к выходному файлу (дописывается в конец)
+        games: Количество партий
+        white_difficulty: Уровень сложности ИИ за белых
+        black_difficulty: Уровень сложности ИИ за черных
+        seed: Начальное значение генератора случайных чисел
+        renderer: ConsoleRenderer для наблюдения за партиями (None - без вывода)
+    """
+    rng = random.Random(seed)
+    with open(path, 'a', encoding='utf-8') as f:
+        for game in range(games):
+            positions, result = play_game(white_difficulty, black_difficulty, rng=rng,
+                                          renderer=renderer)
+            f.writelines(f"{position} {result}\n" for position in positions)
+            print(f"Партия {game + 1}/{games}: результат {result}, позиций {len(positions)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Игры ИИ против ИИ")
+    parser.add_argument('output', help="файл для размеченных позиций")
+    parser.add_argument('--games', type=int, default=10, help="количество партий")
+    parser.add_argument('--white', type=int, default=2, help="сложность ИИ за белых")
+    parser.add_argument('--black', type=int, default=2, help="сложность ИИ за черных")
+    parser.add_argument('--seed', type=int, default=None, help="начальное значение генератора")
+    parser.add_argument('--watch', choices=(ConsoleRenderer.FULL, ConsoleRenderer.DIFF),
+                        help="показывать партии: целыми кадрами или только изменения")
+    parser.add_argument('--fps', type=float, default=30, help="максимальная частота кадров при показе")
+    args = parser.parse_args()
+    renderer = ConsoleRenderer(args.watch, args.fps) if args.watch else None
+    generate_positions(args.output, args.games, args.white, args.black, args.seed, renderer)
@@ -0,0 +1,234 @@
+"""
+Модуль проверки ИИ на наборе тактических позиций
+
+Каждая позиция из файла решается итеративным углублением с ограничением
+по времени и количеству просмотренных позиций. Для каждой позиции
+определяются время и количество позиций до нахождения решения - момента,
+начиная с которого ИИ выбирает правильный ход и больше его не меняет.
+Результаты сравниваются с сохраненным эталоном, чтобы ускорения поиска
+не снижали тактическую силу незаметно.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from board import Board
+from ai import AI, SearchAborted
+
+# Файлы с позициями и эталонными результатами
+POSITIONS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tactics.txt')
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tactics_baseline.json')
+
+# Параметры выборочного поиска, с которыми сохраняется эталон (значения по умолчанию AI)
+DEFAULT_OPTIONS = {'lmr': True, 'futility': True, 'extensions': False}
+
+
+def load_positions(path=POSITIONS_FILE):
+    """
+    Чтение тактических позиций
+
+    Формат строки: '<позиция> <строка> <столбец> <строка> <столбец> [# описание]',
+    где позиция записана в формате Board.to_string, а за ней следует лучший ход.
+    Пустые строки и строки, начинающиеся с '#', пропускаются.
+
+    Returns:
+        list: Словари с ключами 'name', 'position', 'best_move', 'comment'
+    """
+    positions = []
+    with open(path, encoding='utf-8') as f:
+        for number, line in enumerate(f, 1):
+            line, _, comment = line.partition('#')
+            if not line.strip():
+                continue
+            fields = line.split()
+            if len(fields) != 5:
+                raise ValueError(f"{path}:{number}: ожидается позиция и ход из четырех чисел")
+            Board.from_string(fields[0])  # Проверка формата позиции
+            positions.append({
+                'name': f"#{len(positions) + 1}",
+                'position': fields[0],
+                'best_move': tuple(map(int, fields[1:])),
+                'comment': comment.strip()
+            })
+    return positions
+
+
+def solve(position, best_move, max_depth=10, max_nodes=100000, time_limit=10.0, ai_options=None):
+    """
+    Решение позиции итеративным углублением
+
+    Поиск продолжается до глубины max_depth или до исчерпания бюджета; итерация,
+    прерванная из-за бюджета, не учитывается.
+
+    Args:
+        position: Позиция в формате Board.to_string
+        best_move: Правильный ход (from_row, from_col, to_row, to_col)
+        max_depth: Максимальная глубина
+        max_nodes: Бюджет по количеству просмотренных позиций
+        time_limit: Бюджет по времени в секундах
+        ai_options: Дополнительные параметры конструктора AI
+
+    Returns:
+        dict: 'solved', 'move' (итоговый ход), 'depth', 'nodes', 'time' (всего),
+              'solve_depth', 'solve_nodes', 'solve_time' (до решения, None если не решена);
+              depth и move относятся к последней завершенной итерации
+              и 'stats' (счетчики выборочного поиска AI.stats)
+    """
+    board = Board.from_string(position)
+    ai = AI(board, player=board.current_player, delay=0, **(ai_options or {}))
+    start = time.time()
+    move = None
+    solution = None
+    depth = 0
+
+    while depth < max_depth:
+        try:
+            move, _ = ai.search(depth + 1, max_nodes - ai.nodes, start + time_limit)
+        except SearchAborted:
+            break
+        depth += 1
+        elapsed = time.time() - start
+        if move == best_move:
+            if solution is None:
+                solution = (depth, ai.nodes, elapsed)
+        else:
+            solution = None
+
+    return {
+        'solved': move == best_move,
+        'move': move,
+        'depth': depth,
+        'nodes': ai.nodes,
+        'time': time.time() - start,
+        'solve_depth': solution[0] if solution else None,
+        'solve_nodes': solution[1] if solution else None,
+        'solve_time': solution[2] if solution else None,
+        'stats': ai.stats
+    }
+
+
+def compare(results, baseline, tolerance=1.5):
+    """
+    Сравнение результатов с эталоном
+
+    Args:
+        results: Результаты по позициям
+        baseline: Эталонные результаты по позициям
+        tolerance: Во сколько раз допускается рост числа позиций до решения
+
+    Returns:
+        list: Описания ухудшений
+    """
+    regressions = []
+    for position, reference in baseline.items():
+        result = results.get(position)
+        name = reference.get('name', position)
+        if result is None or not reference['solved']:
+            continue
+        if not result['solved']:
+            regressions.append(f"{name}: позиция больше не решается")
+        elif result['solve_nodes'] > reference['solve_nodes'] * tolerance:
+            regressions.append(f"{name}: позиций до решения {result['solve_nodes']} "
+                               f"вместо {reference['solve_nodes']}")
+    return regressions
+
+
+def side_by_side(results, baseline):
+    """
+    Сравнение результатов с эталоном без вердикта (для измерения влияния параметров поиска)
+    
+    Args:
+        results: Результаты по позициям
+        baseline: Эталонные результаты по позициям
+        
+    Returns:
+        list: Строки с количеством позиций и временем до решения в эталоне и сейчас
+    """
+    def describe(result):
+        if not result['solved']:
+            return "не решена"
+        return f"{result['solve_nodes']} поз., {result['solve_time']:.2f} с"
+    
+    lines = []
+    for position, result in results.items():
+        reference = baseline.get(position)
+        if reference is not None:
+            lines.append(f"{result['name']}: эталон {describe(reference)}, сейчас {describe(result)}")
+    common = [position for position in results if position in baseline]
+    if common:
+        lines.append(f"Всего: эталон {sum(baseline[p]['nodes'] for p in common)} поз., "
+                     f"{sum(baseline[p]['time'] for p in common):.2f} с; "
+                     f"сейчас {sum(results[p]['nodes'] for p in common)} поз., "
+                     f"{sum(results[p]['time'] for p in common):.2f} с")
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Проверка ИИ на тактических позициях")
+    parser.add_argument('--positions', default=POSITIONS_FILE, help="файл с позициями")
+    parser.add_argument('--baseline', default=BASELINE_FILE, help="файл с эталонными результатами")
+    parser.add_argument('--save-baseline', action='store_true', help="сохранить результаты как эталон")
+    parser.add_argument('--max-depth', type=int, default=10, help="максимальная глубина")
+    parser.add_argument('--nodes', type=int, default=100000, help="бюджет позиций на задачу")
+    parser.add_argument('--time', type=float, default=10.0, help="бюджет времени на задачу, с")
+    parser.add_argument('--no-lmr', action='store_true', help="без сокращения поздних ходов")
+    parser.add_argument('--no-futility', action='store_true', help="без отсечения бесперспективных ходов")
+    parser.add_argument('--extensions', action='store_true', help="с продлением единственных ходов")
+    args = parser.parse_args()
+    ai_options = {'lmr': not args.no_lmr, 'futility': not args.no_futility,
+                  'extensions': args.extensions}
+    measuring = ai_options != DEFAULT_OPTIONS
+    if measuring and args.save_baseline:
+        parser.error("эталон сохраняется только с параметрами поиска по умолчанию")
+
+    results = {}
+    for task in load_positions(args.positions):
+        result = solve(task['position'], task['best_move'], args.max_depth, args.nodes, args.time,
+                       ai_options)
+        result['name'] = task['name']
+        results[task['position']] = result
+        if result['solved']:
+            status = (f"решена: глубина {result['solve_depth']}, позиций {result['solve_nodes']}, "
+                      f"{result['solve_time']:.2f} с")
+        else:
+            move = ' '.join(map(str, result['move'])) if result['move'] else '-'
+            status = f"не решена (ход {move}, глубина {result['depth']}, позиций {result['nodes']})"
+        print(f"{task['name']} {task['comment']}: {status}")
+
+    solved = sum(result['solved'] for result in results.values())
+    print(f"Решено {solved} из {len(results)}, "
+          f"позиций {sum(r['nodes'] for r in results.values())}, "
+          f"время {sum(r['time'] for r in results.values()):.2f} с, "
+          f"средняя достигнутая глубина {sum(r['depth'] for r in results.values()) / len(results):.1f}")
+    stats = {key: sum(r['stats'][key] for r in results.values()) for key in AI(Board()).stats}
+    print("Выборочный поиск: " + ", ".join(f"{key} {value}" for key, value in stats.items()))
+
+    if args.save_baseline:
+        keys = ('name', 'solved', 'solve_depth', 'solve_nodes', 'solve_time', 'nodes', 'time')
+        baseline = {position: {key: result[key] for key in keys} for position, result in results.items()}
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, indent=4, ensure_ascii=False)
+        print(f"Эталон сохранен в {args.baseline}")
+    elif measuring:
+        # Другие параметры поиска - измерение, а не проверка: эталон только для сравнения
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding='utf-8') as f:
+                baseline = json.load(f)
+            print("Сравнение с эталоном (параметры по умолчанию):")
+            for line in side_by_side(results, baseline):
+                print(line)
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare(results, json.load(f))
+        for regression in regressions:
+            print(f"Ухудшение: {regression}")
+        if regressions:
+            sys.exit(1)
+        print("Ухудшений по сравнению с эталоном нет")
+
+
+if __name__ == "__main__":
+    main()
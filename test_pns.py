@@ -0,0 +1,38 @@
+"""
+Проверка решателя df-pn (запуск: python -m unittest test_pns)
+"""
+
+import unittest
+
+from board import Board
+from pns import ProofNumberSolver, WIN
+
+# Позиция с быстрым выигрышем белых (пример из README)
+SIMPLE_WIN = "W:......../......../......../...W..../......../......../..b...../........"
+
+# Позиция, выигрыш в которой не доказывается за малый бюджет
+HARD_ENDGAME = "B:......../..b.b.../.....b.b/....w.../...w..../..w...../......../....B..."
+
+
+class TestProofNumberSolver(unittest.TestCase):
+    def test_prove_twice_on_one_solver(self):
+        """Бюджет выделяется на каждый вызов prove, а не на время жизни решателя"""
+        solver = ProofNumberSolver(max_nodes=500)
+        hard = Board.from_string(HARD_ENDGAME)
+        self.assertIsNone(solver.prove(hard, hard.current_player))
+        
+        board = Board.from_string(SIMPLE_WIN)
+        self.assertTrue(solver.prove(board, Board.WHITE))
+        self.assertEqual(solver.principal_variation(board, Board.WHITE, max_length=1), [(3, 3, 2, 2)])
+        self.assertTrue(solver.prove(board, Board.WHITE))
+
+    def test_solve_total_budget(self):
+        """solve не раскрывает больше позиций, чем задано max_nodes"""
+        solver = ProofNumberSolver(max_nodes=500)
+        solver.solve(Board.from_string(HARD_ENDGAME))
+        self.assertLessEqual(solver.nodes, 501)
+        self.assertEqual(solver.solve(Board.from_string(SIMPLE_WIN))[0], WIN)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,186 @@
+"""
+Модуль таблиц транспозиций для поиска минимакс
+
+TranspositionTable хранит записи в словаре и принадлежит одному процессу.
+SharedTranspositionTable размещает записи фиксированного размера в блоке
+multiprocessing.shared_memory, поэтому экземпляры ИИ в разных процессах
+могут читать и дополнять одну и ту же таблицу.
+"""
+
+import multiprocessing
+import struct
+from multiprocessing import resource_tracker, shared_memory
+
+# Типы оценок в записи таблицы
+EXACT = 0  # Точная оценка
+LOWER = 1  # Нижняя граница (отсечение по бете)
+UPPER = 2  # Верхняя граница (ни один ход не улучшил альфу)
+
+_MASK64 = (1 << 64) - 1
+
+
+class TranspositionTable:
+    """Таблица транспозиций в памяти текущего процесса"""
+
+    def __init__(self, max_entries=1000000):
+        """
+        Инициализация таблицы
+
+        Args:
+            max_entries: Максимальное число записей; при переполнении таблица очищается
+        """
+        self.max_entries = max_entries
+        self.entries = {}
+
+    def probe(self, key):
+        """
+        Поиск записи для позиции
+
+        Args:
+            key: 64-битный хеш позиции
+
+        Returns:
+            tuple или None: (глубина, тип оценки, оценка, лучший ход (from, to) или None)
+        """
+        return self.entries.get(key)
+
+    def store(self, key, depth, flag, value, move):
+        """
+        Сохранение результата поиска для позиции
+
+        Args:
+            key: 64-битный хеш позиции
+            depth: Оставшаяся глубина поиска
+            flag: Тип оценки (EXACT, LOWER, UPPER)
+            value: Оценка позиции
+            move: Лучший ход в виде пары клеток (from, to), клетка = row * 8 + col, или None
+        """
+        old = self.entries.get(key)
+        if old is not None and old[0] > depth:
+            return  # Не заменяем более глубокий результат
+        if old is None and len(self.entries) >= self.max_entries:
+            self.entries.clear()
+        self.entries[key] = (depth, flag, value, move)
+
+    def items(self):
+        """Все записи таблицы в виде пар (ключ, запись)"""
+        return list(self.entries.items())
+
+    def clear(self):
+        """Очистка таблицы"""
+        self.entries.clear()
+
+
+class SharedTranspositionTable:
+    """
+    Таблица транспозиций фиксированного размера в разделяемой памяти
+
+    Каждая запись занимает 16 байт: проверочное слово (хеш XOR данные) и данные
+    (оценка float32, глубина, тип оценки и лучший ход). Записи читаются и пишутся
+    без блокировок: если запись была повреждена одновременной записью из другого
+    процесса, проверочное слово не совпадет и запись будет проигнорирована.
+
+    Объект можно передавать в другие процессы (например, через multiprocessing.Pool):
+    при распаковке он подключается к тому же блоку памяти по имени.
+    """
+
+    ENTRY = struct.Struct('<QQ')
+
+    def __init__(self, entries=1 << 20, name=None):
+        """
+        Создание новой таблицы или подключение к существующей
+
+        Args:
+            entries: Количество записей (округляется вверх до степени двойки)
+            name: Имя существующего блока разделяемой памяти; None - создать новый
+        """
+        self.owner = name is None
+        if self.owner:
+            size = 1
+            while size < entries:
+                size <<= 1
+            self.shm = shared_memory.SharedMemory(create=True, size=size * self.ENTRY.size)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+            # Блоком управляет создавший его процесс: не даем собственному трекеру
+            # ресурсов независимого процесса удалить блок при его завершении
+            # (дочерние процессы multiprocessing используют общий трекер с родителем)
+            if multiprocessing.parent_process() is None:
+                resource_tracker.unregister(self.shm._name, 'shared_memory')
+            size = self.shm.size // self.ENTRY.size
+        self.size = size
+        self.mask = size - 1
+        self.buffer = self.shm.buf
+
+    @property
+    def name(self):
+        """Имя блока разделяемой памяти для подключения из других процессов"""
+        return self.shm.name
+
+    def __reduce__(self):
+        return (SharedTranspositionTable, (self.size, self.name))
+
+    @staticmethod
+    def _pack(depth, flag, value, move):
+        """Упаковка данных записи в 64-битное слово"""
+        value_bits = struct.unpack('<I', struct.pack('<f', value))[0]
+        move_bits = 0 if move is None else 1 << 12 | move[0] << 6 | move[1]
+        return value_bits | min(depth, 255) << 32 | flag << 40 | move_bits << 42
+
+    def probe(self, key):
+        """
+        Поиск записи для позиции
+
+        Args:
+            key: 64-битный хеш позиции
+
+        Returns:
+            tuple или None: (глубина, тип оценки, оценка, лучший ход (from, to) или None)
+        """
+        check, data = self.ENTRY.unpack_from(self.buffer, (key & self.mask) * self.ENTRY.size)
+        if check ^ data != key or data == 0:
+            return None
+        value = struct.unpack('<f', struct.pack('<I', data & 0xFFFFFFFF))[0]
+        move_bits = data >> 42
+        move = (move_bits >> 6 & 63, move_bits & 63) if move_bits else None
+        return (data >> 32 & 0xFF, data >> 40 & 3, value, move)
+
+    def store(self, key, depth, flag, value, move):
+        """
+        Сохранение результата поиска для позиции
+
+        Args:
+            key: 64-битный хеш позиции
+            depth: Оставшаяся глубина поиска
+            flag: Тип оценки (EXACT, LOWER, UPPER)
+            value: Оценка позиции
+            move: Лучший ход в виде пары клеток (from, to), клетка = row * 8 + col, или None
+        """
+        offset = (key & self.mask) * self.ENTRY.size
+        check, data = self.ENTRY.unpack_from(self.buffer, offset)
+        if check ^ data == key and data >> 32 & 0xFF > depth:
+            return  # Не заменяем более глубокий результат для той же позиции
+        data = self._pack(depth, flag, value, move)
+        self.ENTRY.pack_into(self.buffer, offset, (key ^ data) & _MASK64, data)
+
+    def items(self):
+        """Все действительные записи таблицы в виде пар (ключ, запись)"""
+        result = []
+        for offset in range(0, self.size * self.ENTRY.size, self.ENTRY.size):
+            check, data = self.ENTRY.unpack_from(self.buffer, offset)
+            if data:
+                key = check ^ data
+                if key & self.mask == offset // self.ENTRY.size:
+                    result.append((key, self.probe(key)))
+        return result
+
+    def clear(self):
+        """Очистка таблицы"""
+        self.buffer[:] = bytes(len(self.buffer))
+
+    def close(self):
+        """Отключение от блока; создатель таблицы также удаляет блок"""
+        self.buffer = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
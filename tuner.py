@@ -0,0 +1,138 @@
+"""
+Модуль настройки весов оценочной функции по размеченным позициям (метод Texel)
+
+Для работы требуется библиотека NumPy (pip install numpy).
+Сама игра от нее не зависит.
+"""
+
+import argparse
+import os
+
+import numpy as np
+
+from board import Board
+from ai import FEATURES, WEIGHTS_FILE, extract_features, load_weights, save_weights
+
+
+def load_dataset(path):
+    """
+    Загрузка размеченных позиций и вычисление их признаков
+    
+    Признаки кешируются в файле '<path>.npz' и пересчитываются,
+    только если файл с позициями изменился.
+    
+    Args:
+        path: Файл со строками '<позиция> <результат>' (см. selfplay.py)
+        
+    Returns:
+        tuple: (матрица признаков N x F, вектор результатов N)
+    """
+    cache_path = path + '.npz'
+    if os.path.exists(cache_path) and os.path.getmtime(cache_path) >= os.path.getmtime(path):
+        data = np.load(cache_path)
+        if tuple(data['features']) == FEATURES:
+            return data['X'], data['y']
+    
+    rows = []
+    results = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            position, result = line.split()
+            rows.append(extract_features(Board.from_string(position)))
+            results.append(float(result))
+    
+    X = np.array(rows, dtype=np.float64).reshape(-1, len(FEATURES))
+    y = np.array(results, dtype=np.float64)
+    np.savez(cache_path, X=X, y=y, features=np.array(FEATURES))
+    return X, y
+
+
+def _sigmoid(z):
+    """Логистическая функция"""
+    return 1.0 / (1.0 + np.exp(-np.clip(z, -500, 500)))
+
+
+def log_loss(X, y, weights, scale):
+    """Средняя логистическая ошибка предсказания результатов по оценкам позиций"""
+    p = np.clip(_sigmoid(scale * (X @ weights)), 1e-12, 1 - 1e-12)
+    return float(-np.mean(y * np.log(p) + (1 - y) * np.log(1 - p)))
+
+
+def fit_scale(X, y, weights, low=1e-4, high=1.0, iterations=60):
+    """
+    Подбор масштаба K, переводящего оценку позиции в вероятность победы
+    
+    Используется поиск золотым сечением по логарифму K.
+    
+    Returns:
+        float: Масштаб K с минимальной ошибкой для текущих весов
+    """
+    ratio = (np.sqrt(5) - 1) / 2
+    a, b = np.log(low), np.log(high)
+    for _ in range(iterations):
+        c = b - ratio * (b - a)
+        d = a + ratio * (b - a)
+        if log_loss(X, y, weights, np.exp(c)) < log_loss(X, y, weights, np.exp(d)):
+            b = d
+        else:
+            a = c
+    return float(np.exp((a + b) / 2))
+
+
+def tune(X, y, weights, scale, iterations=20, l2=1e-3):
+    """
+    Подбор весов логистической регрессией (метод Ньютона) при фиксированном масштабе
+    
+    Args:
+        X: Матрица признаков N x F
+        y: Результаты партий (1, 0.5, 0) с точки зрения белых
+        weights: Начальные веса
+        scale: Масштаб K (см. fit_scale)
+        iterations: Максимальное число итераций
+        l2: Коэффициент L2-регуляризации
+        
+    Returns:
+        numpy.ndarray: Настроенные веса в единицах оценочной функции
+    """
+    beta = scale * np.asarray(weights, dtype=np.float64)
+    n, f = X.shape
+    for _ in range(iterations):
+        p = _sigmoid(X @ beta)
+        gradient = X.T @ (p - y) / n + l2 * beta
+        hessian = (X * (p * (1 - p))[:, None]).T @ X / n + l2 * np.eye(f)
+        step = np.linalg.solve(hessian, gradient)
+        beta -= step
+        if np.max(np.abs(step)) < 1e-9:
+            break
+    return beta / scale
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Настройка весов оценочной функции")
+    parser.add_argument('positions', help="файл размеченных позиций")
+    parser.add_argument('--output', default=WEIGHTS_FILE, help="файл для сохранения весов")
+    parser.add_argument('--iterations', type=int, default=20, help="максимальное число итераций")
+    args = parser.parse_args()
+    
+    X, y = load_dataset(args.positions)
+    print(f"Загружено позиций: {len(y)}")
+    
+    current = load_weights()
+    weights = np.array([current[name] for name in FEATURES], dtype=np.float64)
+    scale = fit_scale(X, y, weights)
+    print(f"Масштаб K = {scale:.5f}, ошибка до настройки: {log_loss(X, y, weights, scale):.5f}")
+    
+    weights = tune(X, y, weights, scale, args.iterations)
+    print(f"Ошибка после настройки: {log_loss(X, y, weights, scale):.5f}")
+    
+    tuned = {name: round(float(value), 4) for name, value in zip(FEATURES, weights)}
+    for name in FEATURES:
+        print(f"  {name}: {current[name]} -> {tuned[name]}")
+    save_weights(tuned, args.output)
+    print(f"Веса сохранены в {args.output}")
+
+
+if __name__ == "__main__":
+    main()